@@ -215,6 +215,7 @@ st.markdown("""
 def create_sentiment_pie(df):
     """Pie chart dengan warna yang jelas dan kontras"""
     opinion_counts = df['opinion'].value_counts()
+    opinion_counts = opinion_counts[opinion_counts > 0]
     
     # Warna yang sangat kontras
     colors = {
@@ -0,0 +1,218 @@
+# benchmark_analyzer.py
+"""
+Benchmark kecepatan inferensi IndoBERTSentimentAnalyzer
+
+Sweep batch size, max_length, jumlah thread, dan backend pada korpus
+teks tetap dari data/processed_data.csv. Setiap konfigurasi dijalankan di
+process baru agar peak RSS bisa dibandingkan antar konfigurasi. Hasil
+ditulis ke JSON agar bisa dibandingkan antar versi.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import torch
+
+import config
+from indobert_analyzer import IndoBERTSentimentAnalyzer
+
+
+def get_peak_rss_mb():
+    """
+    Peak resident memory process ini dalam MB (None jika tidak bisa diukur)
+
+    Nilainya peak sejak process dimulai, jadi hanya bermakna per konfigurasi
+    jika dipanggil di process yang menjalankan satu konfigurasi saja.
+    """
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux: KB, macOS: byte
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        pass
+
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+def load_corpus(data_path='data/processed_data.csv', text_column='content', num_texts=512):
+    """
+    Korpus benchmark tetap: num_texts teks tidak kosong pertama dari CSV
+
+    Returns:
+        List teks
+    """
+    df = pd.read_csv(data_path, encoding='utf-8-sig', usecols=[text_column])
+    texts = df[text_column].dropna().astype(str)
+    texts = texts[texts.str.strip() != '']
+    return texts.head(num_texts).tolist()
+
+
+def benchmark_config(analyzer, texts, batch_size, max_length):
+    """
+    Jalankan satu konfigurasi benchmark
+
+    Returns:
+        dict hasil (texts/sec, latency per batch p50/p95, peak RSS)
+    """
+    # Warmup agar load model & alokasi pertama tidak ikut terukur
+    analyzer.predict_proba_batch(texts[:batch_size], max_length=max_length)
+
+    latencies = []
+    start = time.perf_counter()
+    for positions, inputs in analyzer.iter_length_batches(texts, batch_size=batch_size, max_length=max_length):
+        batch_start = time.perf_counter()
+        analyzer._forward(inputs)
+        latencies.append(time.perf_counter() - batch_start)
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'texts': len(texts),
+        'seconds': elapsed,
+        'texts_per_sec': len(texts) / elapsed if elapsed > 0 else 0,
+        'batch_latency_p50_ms': float(np.percentile(latencies_ms, 50)),
+        'batch_latency_p95_ms': float(np.percentile(latencies_ms, 95)),
+        'peak_rss_mb': get_peak_rss_mb()
+    }
+
+
+def _run_config(init_kwargs, texts, batch_size, max_length, num_threads):
+    """
+    Jalankan satu konfigurasi benchmark di process terpisah
+
+    Thread diterapkan ke torch dan ke session ONNX Runtime (onnx_threads),
+    lalu model di-load baru sehingga peak RSS hanya milik konfigurasi ini.
+
+    Returns:
+        dict hasil benchmark_config + model_id, atau {'error': ...} jika backend gagal di-load
+    """
+    torch.set_num_threads(num_threads)
+
+    try:
+        analyzer = IndoBERTSentimentAnalyzer(**{**init_kwargs, 'onnx_threads': num_threads})
+        analyzer.warmup()
+    except Exception as e:
+        return {'error': str(e)}
+
+    result = benchmark_config(analyzer, texts, batch_size, max_length)
+    result['model_id'] = analyzer.model_id
+    return result
+
+
+def run_benchmark(backends=('torch',), batch_sizes=(8, 16, 32), max_lengths=(128, 512),
+                  thread_counts=None, num_texts=512, data_path='data/processed_data.csv'):
+    """
+    Sweep semua kombinasi konfigurasi
+
+    Returns:
+        dict laporan (metadata + list hasil per konfigurasi)
+    """
+    thread_counts = thread_counts or [torch.get_num_threads()]
+    texts = load_corpus(data_path, num_texts=num_texts)
+    print(f"[INFO] Korpus benchmark: {len(texts)} teks dari {data_path}")
+
+    results = []
+    context = multiprocessing.get_context('spawn')
+    for backend in backends:
+        init_kwargs = {
+            'backend': backend,
+            'quantize': config.ONNX_QUANTIZE,
+            'onnx_dir': config.ONNX_MODEL_DIR,
+            'model_path': config.SENTIMENT_MODEL_PATH,
+            'local_files_only': config.SENTIMENT_OFFLINE,
+            'student_path': config.STUDENT_MODEL_PATH
+        }
+        error = None
+
+        for num_threads in thread_counts:
+            for max_length in max_lengths:
+                for batch_size in batch_sizes:
+                    if error is not None:
+                        break
+
+                    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                        result = executor.submit(
+                            _run_config, init_kwargs, texts, batch_size, max_length, num_threads
+                        ).result()
+
+                    if 'error' in result:
+                        error = result['error']
+                        print(f"[WARNING] Backend '{backend}' dilewati: {error}")
+                        results.append({'backend': backend, 'error': error})
+                        break
+
+                    result.update({
+                        'backend': backend,
+                        'batch_size': batch_size,
+                        'max_length': max_length,
+                        'num_threads': num_threads
+                    })
+                    results.append(result)
+                    print(f"[BENCH] {backend:8s} threads={num_threads:<3d} max_len={max_length:<4d} "
+                          f"batch={batch_size:<3d} -> {result['texts_per_sec']:8.1f} teks/detik | "
+                          f"p50 {result['batch_latency_p50_ms']:.1f} ms | p95 {result['batch_latency_p95_ms']:.1f} ms | "
+                          f"peak RSS {result['peak_rss_mb'] or 0:.0f} MB")
+
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'torch': torch.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'corpus': {'path': data_path, 'texts': len(texts)},
+        'results': results
+    }
+
+
+def parse_list(value, cast=int):
+    """Parse argumen '8,16,32' menjadi list"""
+    return [cast(item) for item in value.split(',') if item.strip()]
+
+
+def main():
+    """Jalankan benchmark dari command line"""
+    parser = argparse.ArgumentParser(description='Benchmark inferensi IndoBERTSentimentAnalyzer')
+    parser.add_argument('--backends', default='torch', help="Contoh: torch,onnx,student")
+    parser.add_argument('--batch-sizes', default='8,16,32')
+    parser.add_argument('--max-lengths', default='128,512')
+    parser.add_argument('--threads', default=str(torch.get_num_threads()), help='Contoh: 1,2,4')
+    parser.add_argument('--num-texts', type=int, default=512)
+    parser.add_argument('--data', default='data/processed_data.csv')
+    parser.add_argument('--output', default=None, help='Path JSON output (default: output/benchmark_<waktu>.json)')
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        backends=parse_list(args.backends, str),
+        batch_sizes=parse_list(args.batch_sizes),
+        max_lengths=parse_list(args.max_lengths),
+        thread_counts=parse_list(args.threads),
+        num_texts=args.num_texts,
+        data_path=args.data
+    )
+
+    output_path = args.output or os.path.join('output', f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json")
+    directory = os.path.dirname(output_path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"[SAVE] Hasil benchmark disimpan ke: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
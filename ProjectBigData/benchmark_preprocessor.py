@@ -0,0 +1,157 @@
+# benchmark_preprocessor.py
+"""
+Benchmark kecepatan TextPreprocessor pada data/raw_data.csv
+
+Membandingkan jalur per baris (Series.apply) dengan jalur vectorized dan
+memastikan hasil keduanya identik.
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+import pandas as pd
+from Sastrawi.Stemmer.CachedStemmer import CachedStemmer
+from Sastrawi.Stemmer.Cache.ArrayCache import ArrayCache
+
+from stem_cache import StemCache
+from text_preprocessor import TextPreprocessor
+
+
+def time_best(func, repeat=3):
+    """
+    Jalankan func beberapa kali, return (waktu tercepat dalam detik, hasil)
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def compare(name, baseline, candidate, repeat=3, labels=('apply', 'vectorized')):
+    """
+    Bandingkan dua implementasi yang harus menghasilkan output identik
+
+    Returns:
+        dict hasil (waktu, speed-up, identik/tidak)
+    """
+    baseline_sec, expected = time_best(baseline, repeat)
+    candidate_sec, actual = time_best(candidate, repeat)
+
+    identical = list(expected) == list(actual)
+    result = {
+        'step': name,
+        'baseline_sec': baseline_sec,
+        'vectorized_sec': candidate_sec,
+        'speedup': baseline_sec / candidate_sec if candidate_sec > 0 else 0,
+        'identical': identical
+    }
+
+    status = 'identik' if identical else 'BERBEDA'
+    print(f"[BENCH] {name:12s} {labels[0]} {baseline_sec:7.3f} s | {labels[1]} {candidate_sec:7.3f} s "
+          f"| speed-up {result['speedup']:5.2f}x | hasil {status}")
+    if not identical:
+        print(f"[WARNING] Hasil {name} tidak identik dengan jalur {labels[0]}!")
+
+    return result
+
+
+def run_benchmark(data_path='data/raw_data.csv', text_column='content', repeat=3, stem_sample=500):
+    """
+    Benchmark semua langkah preprocessing yang punya jalur cepat
+
+    Args:
+        data_path: CSV korpus
+        text_column: Kolom teks
+        repeat: Jumlah pengulangan (diambil waktu tercepat)
+        stem_sample: Jumlah teks untuk benchmark stemming (Sastrawi sangat lambat)
+
+    Returns:
+        dict laporan
+    """
+    df = pd.read_csv(data_path, encoding='utf-8-sig')
+    texts = df[text_column]
+    print(f"[INFO] Korpus benchmark: {len(texts)} teks dari {data_path}")
+
+    preprocessor = TextPreprocessor()
+    results = [
+        compare(
+            'clean',
+            lambda: texts.apply(preprocessor.clean_text),
+            lambda: preprocessor.clean_series(texts),
+            repeat=repeat
+        )
+    ]
+
+    # Stemming: Sastrawi (cache per instance) vs StemCache, keduanya mulai kosong (cold)
+    # lalu keduanya sudah terisi (warm). StemCache warm = kondisi setelah di-load dari disk,
+    # sedangkan cache Sastrawi selalu kosong lagi di run berikutnya.
+    base_stemmer = preprocessor.stemmer.delegatedStemmer
+    stem_input = preprocessor.clean_series(texts.head(stem_sample)).apply(preprocessor.remove_stopwords)
+    print(f"[INFO] Benchmark stemming: {len(stem_input)} teks")
+
+    results.append(compare(
+        'stem (cold)',
+        lambda: stem_input.apply(CachedStemmer(ArrayCache(), base_stemmer).stem),
+        lambda: stem_input.apply(StemCache(base_stemmer).stem),
+        repeat=1,
+        labels=('sastrawi', 'stem cache')
+    ))
+
+    warm_sastrawi = CachedStemmer(ArrayCache(), base_stemmer)
+    stem_input.apply(warm_sastrawi.stem)
+    warm_cache = StemCache(base_stemmer)
+    stem_input.apply(warm_cache.stem)
+    results.append(compare(
+        'stem (warm)',
+        lambda: stem_input.apply(warm_sastrawi.stem),
+        lambda: stem_input.apply(warm_cache.stem),
+        repeat=1,
+        labels=('sastrawi', 'stem cache')
+    ))
+    warm_cache.print_stats()
+
+    # Hapus stopwords + stemming: per baris vs Series (stem cache sudah terisi untuk keduanya)
+    preprocessor.stem_cache = warm_cache
+    cleaned = preprocessor.clean_series(texts.head(stem_sample))
+    results.append(compare(
+        'stop+stem',
+        lambda: cleaned.apply(preprocessor.remove_stopwords_and_stem),
+        lambda: preprocessor.remove_stopwords_and_stem_series(cleaned),
+        repeat=repeat
+    ))
+
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'corpus': {'path': data_path, 'texts': len(texts), 'stem_sample': len(stem_input)},
+        'results': results
+    }
+
+
+def main():
+    """Jalankan benchmark dari command line"""
+    parser = argparse.ArgumentParser(description='Benchmark TextPreprocessor')
+    parser.add_argument('--data', default='data/raw_data.csv')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--stem-sample', type=int, default=500, help='Jumlah teks untuk benchmark stemming')
+    parser.add_argument('--output', default=None, help='Path JSON output (opsional)')
+    args = parser.parse_args()
+
+    report = run_benchmark(data_path=args.data, repeat=args.repeat, stem_sample=args.stem_sample)
+
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"[SAVE] Hasil benchmark disimpan ke: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
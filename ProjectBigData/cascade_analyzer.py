@@ -0,0 +1,196 @@
+# cascade_analyzer.py
+"""
+Cascade analisis sentimen: model cepat (TF-IDF + Naive Bayes) dulu,
+IndoBERT hanya untuk data yang confidence-nya rendah
+"""
+
+import os
+import joblib
+import numpy as np
+import pandas as pd
+
+
+def save_fast_model(model, vectorizer, path):
+    """
+    Simpan model cepat (classifier + vectorizer) ke file
+
+    Args:
+        model: Classifier scikit-learn yang sudah dilatih
+        vectorizer: TfidfVectorizer yang sudah di-fit
+        path: Path file output (.joblib)
+    """
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    joblib.dump({'model': model, 'vectorizer': vectorizer}, path)
+    print(f"[SAVE] Model cepat disimpan ke: {path}")
+
+
+def load_fast_model(path):
+    """Load model cepat, return (model, vectorizer) atau (None, None) jika belum ada"""
+    if not os.path.exists(path):
+        return None, None
+
+    bundle = joblib.load(path)
+    return bundle['model'], bundle['vectorizer']
+
+
+class CascadeSentimentAnalyzer:
+    def __init__(self, analyzer, fast_model, vectorizer, threshold=0.8):
+        """
+        Initialize cascade analyzer
+
+        Args:
+            analyzer: IndoBERTSentimentAnalyzer untuk data yang tidak yakin
+            fast_model: Classifier cepat dengan predict_proba (MultinomialNB)
+            vectorizer: Vectorizer untuk classifier cepat
+            threshold: Batas confidence model cepat, di bawah ini diteruskan ke IndoBERT
+        """
+        self.analyzer = analyzer
+        self.fast_model = fast_model
+        self.vectorizer = vectorizer
+        self.threshold = threshold
+
+    def predict_fast(self, texts):
+        """
+        Prediksi dengan model cepat
+
+        Args:
+            texts: List teks hasil preprocessing
+
+        Returns:
+            dict {nama kolom: numpy array} seperti IndoBERTSentimentAnalyzer.score_texts
+        """
+        features = self.vectorizer.transform(texts)
+        probs = self.fast_model.predict_proba(features)
+        classes = list(self.fast_model.classes_)
+
+        def class_prob(label):
+            if label in classes:
+                return probs[:, classes.index(label)]
+            return np.zeros(len(texts))
+
+        pred_labels = probs.argmax(axis=1)
+
+        return {
+            'sentiment': np.array(classes, dtype=object)[pred_labels],
+            'sentiment_confidence': probs[np.arange(len(texts)), pred_labels],
+            'prob_positif': class_prob('Positif'),
+            'prob_negatif': class_prob('Negatif'),
+            'prob_netral': class_prob('Netral')
+        }
+
+    def analyze_dataframe(self, df, text_column='content', fast_text_column='processed_text', batch_size=16,
+                          **score_kwargs):
+        """
+        Analisis sentimen bertingkat untuk DataFrame
+
+        Args:
+            df: DataFrame dengan kolom teks asli dan teks hasil preprocessing
+            text_column: Kolom teks untuk IndoBERT
+            fast_text_column: Kolom teks untuk model cepat (sama dengan saat training)
+            batch_size: Jumlah teks per forward pass IndoBERT
+            **score_kwargs: Opsi tier IndoBERT, sama dengan IndoBERTSentimentAnalyzer.score_dataframe
+                (max_length, max_length_by_source, long_text, num_workers, checkpoint_path, ...)
+
+        Returns:
+            DataFrame dengan kolom sentimen tambahan dan kolom 'sentiment_tier'
+        """
+        print("[INFO] Memulai analisis sentimen cascade (Naive Bayes -> IndoBERT)...")
+        print(f"[INFO] Total data: {len(df)} | Threshold confidence: {self.threshold}")
+
+        for column in (text_column, fast_text_column):
+            if column not in df.columns:
+                print(f"[ERROR] Kolom '{column}' tidak ditemukan!")
+                return df
+
+        # Tier 1: model cepat untuk semua data
+        results = self.predict_fast(df[fast_text_column].fillna('').astype(str))
+        fast_sentiment = np.asarray(results['sentiment'], dtype=object).copy()
+        tier = np.full(len(df), 'fast', dtype=object)
+
+        # Tier 2: IndoBERT hanya untuk data dengan confidence rendah
+        uncertain = np.flatnonzero(results['sentiment_confidence'] < self.threshold)
+        print(f"[INFO] {len(uncertain)} data diteruskan ke IndoBERT")
+
+        if len(uncertain) > 0:
+            bert_results = self.analyzer.score_dataframe(
+                df.iloc[uncertain], text_column=text_column, batch_size=batch_size, **score_kwargs
+            )
+            for column, values in bert_results.items():
+                results[column][uncertain] = np.asarray(values)
+            tier[uncertain] = 'indobert'
+
+        for column, values in results.items():
+            df[column] = values
+        df['sentiment_tier'] = tier
+        self.analyzer.add_opinion_column(df)
+
+        self.report = self.build_report(fast_sentiment, results['sentiment'], uncertain)
+        self.print_report()
+        self.analyzer.print_distribution(df)
+
+        print(f"\n[SUCCESS] Analisis cascade selesai untuk {len(df)} data")
+
+        return df
+
+    def build_report(self, fast_sentiment, final_sentiment, uncertain):
+        """Ringkasan cascade: panggilan IndoBERT yang dihindari & agreement antar tier"""
+        total = len(fast_sentiment)
+        escalated = len(uncertain)
+        agree = int((fast_sentiment[uncertain] == final_sentiment[uncertain]).sum()) if escalated else 0
+
+        return {
+            'total': total,
+            'fast': total - escalated,
+            'indobert': escalated,
+            'avoided_pct': ((total - escalated) / total * 100) if total > 0 else 0,
+            'escalated_agreement_pct': (agree / escalated * 100) if escalated > 0 else 0
+        }
+
+    def print_report(self):
+        """Print ringkasan cascade"""
+        report = self.report
+        print("\n[CASCADE] Ringkasan tier:")
+        print(f"   Naive Bayes : {report['fast']}")
+        print(f"   IndoBERT    : {report['indobert']}")
+        print(f"   Panggilan IndoBERT dihindari: {report['avoided_pct']:.1f}%")
+        print(f"   Agreement NB vs IndoBERT (data tidak yakin): {report['escalated_agreement_pct']:.1f}%")
+
+
+def main():
+    """Testing cascade analyzer"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.naive_bayes import MultinomialNB
+    from indobert_analyzer import IndoBERTSentimentAnalyzer
+
+    train_texts = [
+        'dukung natural kuat tingkat prestasi bagus',
+        'tolak kontra lemah gagal masalah',
+        'main bola latih fisik teknik'
+    ] * 10
+    train_labels = ['Positif', 'Negatif', 'Netral'] * 10
+
+    vectorizer = TfidfVectorizer()
+    model = MultinomialNB().fit(vectorizer.fit_transform(train_texts), train_labels)
+
+    df = pd.DataFrame({
+        'content': [
+            "Naturalisasi pemain timnas Indonesia sangat bagus untuk meningkatkan prestasi!",
+            "Saya tidak setuju dengan naturalisasi pemain asing untuk timnas",
+            "Pemain timnas Indonesia berlatih di stadion"
+        ],
+        'processed_text': [
+            'natural bagus tingkat prestasi',
+            'tidak setuju natural asing',
+            'latih stadion'
+        ]
+    })
+
+    cascade = CascadeSentimentAnalyzer(IndoBERTSentimentAnalyzer(), model, vectorizer, threshold=0.8)
+    print(cascade.analyze_dataframe(df)[['content', 'sentiment', 'sentiment_tier']])
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -88,4 +88,60 @@ DOMAIN_STOPWORDS = [
     'timnas', 'indonesia', 'sepak', 'bola', 'pemain', 'naturalisasi',
     'jakarta', 'surabaya', 'bandung', 'artikel', 'berita', 'news',
     'com', 'detik', 'kompas', 'tribun', 'cnn', 'republika'
-]
\ No newline at end of file
+]
+
+# Cache stemming per kata (Sastrawi sangat lambat, kosakata korpus kecil)
+STEM_CACHE_PATH = 'data/stem_cache.json'  # None = cache hanya di memori
+STEM_CACHE_MAX_ENTRIES = 100000  # Kata paling lama tidak dipakai dibuang jika melebihi batas
+PREPROCESS_NUM_WORKERS = 1  # > 1 untuk preprocessing paralel multi-process
+PREPROCESS_STORE_PATH = 'data/preprocess_store.db'  # Hasil preprocessing per teks, None = preprocess ulang semua
+PREPROCESS_CHUNK_SIZE = None  # Contoh: 10000 = mode streaming raw_data.csv per chunk (memori dibatasi ukuran chunk)
+PREPROCESSED_DATA_PATH = 'data/preprocessed_data.csv'  # Output mode streaming
+WORD_CORPUS_ENABLED = True  # Vocabulary + id kata int32 untuk TF-IDF model prediksi (tanpa split ulang teks)
+WORD_CORPUS_PATH = 'data/word_corpus.npz'  # None = tidak disimpan
+# Word cloud dari word corpus: tanpa collocation (bigram) & penggabungan bentuk jamak
+# WordCloud.generate, jadi gambar berbeda. Aktifkan setelah hasilnya dibandingkan.
+WORDCLOUD_FROM_CORPUS = False
+
+# Cache prediksi sentimen (SQLite lokal)
+SENTIMENT_CACHE_ENABLED = True  # Set False untuk selalu analisis ulang semua data
+SENTIMENT_CACHE_PATH = 'data/sentiment_cache.db'
+SENTIMENT_CACHE_MAX_ENTRIES = 200000  # Entry paling lama tidak dipakai dihapus jika melebihi batas
+
+# Model sentimen
+SENTIMENT_MODEL_PATH = None  # Path folder model lokal (mode offline), None = download dari Hugging Face
+SENTIMENT_OFFLINE = False  # True = jangan akses internet, pakai cache Hugging Face lokal saja
+
+# Backend inferensi model sentimen
+SENTIMENT_BACKEND = 'torch'  # 'torch' (PyTorch), 'onnx' (ONNX Runtime CPU), atau 'student' (model distilasi)
+ONNX_QUANTIZE = True  # Dynamic int8 quantization untuk backend 'onnx'
+ONNX_MODEL_DIR = 'models/onnx'  # Cache file hasil export ONNX
+STUDENT_MODEL_PATH = 'models/student'  # Output distill_student.py, dipakai backend 'student'
+SENTIMENT_NUM_WORKERS = 1  # > 1 untuk scoring paralel multi-process (backfill data besar)
+THREAD_TUNING_PATH = 'data/thread_tuning.json'  # Hasil thread_tuner.py, dipakai analyzer saat startup
+TOKEN_STORE_DIR = 'data/token_store'  # Input ids hasil tokenisasi (memmap), None = tokenize ulang tiap run
+
+# Budget token per sumber data (kolom 'source'), sumber lain memakai SENTIMENT_MAX_LENGTH
+SENTIMENT_MAX_LENGTH = 512
+SENTIMENT_MAX_LENGTH_BY_SOURCE = {
+    'YouTube': 128  # Komentar pendek: batch kecil & cepat
+}
+SENTIMENT_LONG_TEXT_MODE = 'window'  # 'window' (per window kalimat lalu diagregasi) atau 'truncate'
+
+# Embedding teks (float16) dari forward pass yang sama, untuk clustering & similarity search
+VECTOR_STORE_PATH = None  # Contoh: 'data/vector_store' (cache prediksi tidak dipakai saat aktif)
+
+# Checkpoint analisis sentimen (lanjutkan run yang terhenti)
+SENTIMENT_CHECKPOINT_PATH = 'data/sentiment_checkpoint.csv'  # None = tanpa checkpoint
+SENTIMENT_CHECKPOINT_EVERY = 500  # Jumlah baris per checkpoint
+
+# Cascade: model cepat (TF-IDF + Naive Bayes) dulu, IndoBERT hanya untuk data tidak yakin
+CASCADE_ENABLED = False  # Butuh model cepat hasil training run sebelumnya
+CASCADE_THRESHOLD = 0.8  # Confidence model cepat di bawah ini diteruskan ke IndoBERT
+FAST_MODEL_PATH = 'models/fast_model.joblib'
+
+# Sentiment server lokal (sentiment_server.py), satu model ter-load per host
+SENTIMENT_SERVER_HOST = '127.0.0.1'
+SENTIMENT_SERVER_PORT = 8765
+SENTIMENT_SERVER_MAX_BATCH = 32  # Jumlah teks maksimal per micro-batch
+SENTIMENT_SERVER_MAX_WAIT_MS = 10  # Waktu tunggu maksimal pengumpulan micro-batch
\ No newline at end of file
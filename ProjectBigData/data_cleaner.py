@@ -1,4 +1,5 @@
 # data_cleaner.py
+import hashlib
 import pandas as pd
 import re
 
@@ -82,6 +83,27 @@ class DataCleaner:
         
         return df
     
+    def remove_seen_duplicates(self, df, seen_keys):
+        """
+        Hapus duplikat di dalam chunk dan terhadap chunk sebelumnya (mode streaming)
+        
+        Args:
+            df: DataFrame satu chunk
+            seen_keys: Set hash content dari chunk sebelumnya (diperbarui di sini)
+        
+        Returns:
+            DataFrame tanpa duplikat
+        """
+        df = df.drop_duplicates(subset=['content'], keep='first')
+        
+        keys = df['content'].map(
+            lambda text: hashlib.sha1(text.encode('utf-8')).digest() if isinstance(text, str) else None
+        )
+        is_seen = keys.map(lambda key: key is not None and key in seen_keys).astype(bool)
+        seen_keys.update(key for key in keys[~is_seen] if key is not None)
+        
+        return df[~is_seen]
+    
     def remove_spam(self, df):
         """Hapus spam content"""
         print("[CLEAN] Menghapus spam...")
@@ -0,0 +1,242 @@
+# distill_student.py
+"""
+Distilasi model sentimen: latih model student kecil dari probabilitas teacher
+(kolom prob_* di processed_data.csv) untuk scoring komentar volume besar
+"""
+
+import argparse
+import os
+import re
+import time
+import numpy as np
+import pandas as pd
+import torch
+from torch.utils.data import DataLoader
+from transformers import AutoConfig, AutoTokenizer, AutoModelForSequenceClassification
+
+import config
+from indobert_analyzer import IndoBERTSentimentAnalyzer, SENTIMENT_MODEL
+
+# Urutan index label model (sama dengan label_map IndoBERTSentimentAnalyzer)
+TEACHER_PROB_COLUMNS = ['prob_negatif', 'prob_netral', 'prob_positif']
+
+
+def build_student(teacher_id, num_layers=4):
+    """
+    Buat student dari teacher dengan mengambil sebagian layer encoder
+
+    Embedding dan classifier head disalin dari teacher, layer encoder diambil
+    merata (misalnya layer 0, 4, 8, 11 untuk 4 layer dari 12).
+
+    Args:
+        teacher_id: Nama/path model teacher
+        num_layers: Jumlah layer encoder student
+
+    Returns:
+        Model student (AutoModelForSequenceClassification)
+    """
+    teacher = AutoModelForSequenceClassification.from_pretrained(teacher_id)
+    teacher_layers = teacher.config.num_hidden_layers
+    num_layers = min(num_layers, teacher_layers)
+
+    student_config = AutoConfig.from_pretrained(teacher_id)
+    student_config.num_hidden_layers = num_layers
+    student = AutoModelForSequenceClassification.from_config(student_config)
+
+    kept = np.linspace(0, teacher_layers - 1, num_layers).round().astype(int).tolist()
+    print(f"[INFO] Student {num_layers} layer, diambil dari layer teacher {kept}")
+
+    teacher_state = teacher.state_dict()
+    student_state = {}
+    for key in student.state_dict():
+        match = re.search(r'encoder\.layer\.(\d+)\.', key)
+        source = key
+        if match:
+            source = key.replace(f'encoder.layer.{match.group(1)}.', f'encoder.layer.{kept[int(match.group(1))]}.', 1)
+        student_state[key] = teacher_state[source]
+    student.load_state_dict(student_state)
+
+    return student
+
+
+def load_teacher_data(data_path, text_column='content', test_size=0.2, seed=42):
+    """
+    Load teks + probabilitas teacher dan bagi menjadi train / held-out
+
+    Jika data hasil mode cascade (ada kolom 'sentiment_tier'), hanya baris
+    yang dianalisis IndoBERT yang dipakai; baris lain berisi probabilitas
+    Naive Bayes, bukan teacher.
+
+    Returns:
+        Tuple (texts_train, probs_train, texts_test, probs_test)
+    """
+    df = pd.read_csv(data_path, encoding='utf-8-sig')
+    if 'sentiment_tier' in df.columns:
+        df = df[df['sentiment_tier'] == 'indobert']
+        print(f"[INFO] Data cascade: {len(df)} baris berlabel IndoBERT dipakai sebagai teacher")
+    df = df.dropna(subset=[text_column] + TEACHER_PROB_COLUMNS)
+    df = df[df[text_column].astype(str).str.strip() != '']
+
+    texts = df[text_column].astype(str).tolist()
+    probs = df[TEACHER_PROB_COLUMNS].to_numpy(dtype=np.float32)
+
+    order = np.random.RandomState(seed).permutation(len(texts))
+    n_test = int(len(texts) * test_size)
+    test_idx, train_idx = order[:n_test], order[n_test:]
+
+    return (
+        [texts[i] for i in train_idx], probs[train_idx],
+        [texts[i] for i in test_idx], probs[test_idx]
+    )
+
+
+def train_student(student, tokenizer, texts, teacher_probs, epochs=2, batch_size=32,
+                  max_length=128, learning_rate=5e-5, temperature=2.0):
+    """
+    Latih student dengan KL divergence terhadap probabilitas teacher
+
+    Args:
+        student: Model student
+        tokenizer: Tokenizer teacher
+        texts: List teks training
+        teacher_probs: numpy array (n, 3) probabilitas teacher
+        epochs: Jumlah epoch
+        batch_size: Ukuran batch training
+        max_length: Panjang maksimal token
+        learning_rate: Learning rate AdamW
+        temperature: Temperature distilasi
+
+    Returns:
+        Model student yang sudah dilatih
+    """
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    student.to(device)
+    student.train()
+
+    # Logit teacher direkonstruksi dari log-probabilitas, lalu di-soften dengan temperature
+    teacher_logits = torch.log(torch.from_numpy(teacher_probs).clamp_min(1e-8))
+    soft_targets = torch.softmax(teacher_logits / temperature, dim=1)
+
+    optimizer = torch.optim.AdamW(student.parameters(), lr=learning_rate)
+    loader = DataLoader(list(range(len(texts))), batch_size=batch_size, shuffle=True)
+
+    for epoch in range(epochs):
+        total_loss = 0.0
+        for batch_idx in loader:
+            batch_idx = batch_idx.tolist()
+            inputs = tokenizer(
+                [texts[i] for i in batch_idx],
+                return_tensors='pt',
+                truncation=True,
+                max_length=max_length,
+                padding='longest'
+            ).to(device)
+            targets = soft_targets[batch_idx].to(device)
+
+            logits = student(**inputs).logits
+            log_probs = torch.log_softmax(logits / temperature, dim=1)
+            loss = torch.nn.functional.kl_div(log_probs, targets, reduction='batchmean') * temperature ** 2
+
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+            total_loss += loss.item() * len(batch_idx)
+
+        print(f"[TRAIN] Epoch {epoch + 1}/{epochs} - loss: {total_loss / len(texts):.4f}")
+
+    student.eval()
+    return student
+
+
+def measure_throughput(analyzer, texts, batch_size=32, max_length=128):
+    """Hitung throughput (teks/detik) analyzer untuk list teks"""
+    analyzer.warmup()
+    start = time.perf_counter()
+    probs = analyzer.predict_proba_texts(texts, batch_size=batch_size, max_length=max_length, show_progress=False)
+    elapsed = time.perf_counter() - start
+    return len(texts) / elapsed if elapsed > 0 else 0, probs
+
+
+def distill(data_path='data/processed_data.csv', output_dir=None, teacher_id=SENTIMENT_MODEL,
+            num_layers=4, epochs=2, batch_size=32, max_length=128, benchmark_size=500):
+    """
+    Pipeline distilasi lengkap: build, train, simpan, dan evaluasi student
+
+    Returns:
+        dict laporan (agreement held-out & speed-up)
+    """
+    output_dir = output_dir or config.STUDENT_MODEL_PATH
+
+    print("="*70)
+    print("DISTILASI MODEL SENTIMEN (TEACHER -> STUDENT)")
+    print("="*70)
+
+    texts_train, probs_train, texts_test, probs_test = load_teacher_data(data_path)
+    print(f"[INFO] Data training: {len(texts_train)} | Data held-out: {len(texts_test)}")
+
+    tokenizer = AutoTokenizer.from_pretrained(teacher_id)
+    student = build_student(teacher_id, num_layers=num_layers)
+    student = train_student(
+        student, tokenizer, texts_train, probs_train,
+        epochs=epochs, batch_size=batch_size, max_length=max_length
+    )
+
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    student.save_pretrained(output_dir)
+    tokenizer.save_pretrained(output_dir)
+    print(f"[SAVE] Model student disimpan ke: {output_dir}")
+
+    # Evaluasi pada held-out split
+    student_analyzer = IndoBERTSentimentAnalyzer(backend='student', student_path=output_dir)
+    teacher_analyzer = IndoBERTSentimentAnalyzer(sentiment_model=teacher_id)
+
+    bench_texts = texts_test[:benchmark_size]
+    student_tps, _ = measure_throughput(student_analyzer, bench_texts, batch_size=batch_size, max_length=max_length)
+    teacher_tps, _ = measure_throughput(teacher_analyzer, bench_texts, batch_size=batch_size, max_length=max_length)
+
+    student_probs = student_analyzer.predict_proba_texts(
+        texts_test, batch_size=batch_size, max_length=max_length, show_progress=False
+    )
+    agreement = float((student_probs.argmax(axis=1) == probs_test.argmax(axis=1)).mean() * 100) if len(texts_test) else 0
+
+    report = {
+        'held_out': len(texts_test),
+        'agreement_pct': agreement,
+        'teacher_texts_per_sec': teacher_tps,
+        'student_texts_per_sec': student_tps,
+        'speedup': (student_tps / teacher_tps) if teacher_tps > 0 else 0
+    }
+
+    print("\n[RESULT] Evaluasi student (held-out):")
+    print(f"   Agreement dengan teacher: {report['agreement_pct']:.2f}% ({report['held_out']} data)")
+    print(f"   Throughput teacher: {teacher_tps:.1f} teks/detik")
+    print(f"   Throughput student: {student_tps:.1f} teks/detik")
+    print(f"   Speed-up: {report['speedup']:.2f}x")
+
+    return report
+
+
+def main():
+    """Jalankan distilasi dari command line"""
+    parser = argparse.ArgumentParser(description='Distilasi model sentimen ke student kecil')
+    parser.add_argument('--data', default='data/processed_data.csv', help='CSV dengan kolom content & prob_*')
+    parser.add_argument('--output', default=config.STUDENT_MODEL_PATH, help='Folder output model student')
+    parser.add_argument('--layers', type=int, default=4, help='Jumlah layer encoder student')
+    parser.add_argument('--epochs', type=int, default=2)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--max-length', type=int, default=128)
+    args = parser.parse_args()
+
+    distill(
+        data_path=args.data,
+        output_dir=args.output,
+        num_layers=args.layers,
+        epochs=args.epochs,
+        batch_size=args.batch_size,
+        max_length=args.max_length
+    )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
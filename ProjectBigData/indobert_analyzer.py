@@ -1,54 +1,268 @@
 # indobert_analyzer.py
 
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+import multiprocessing
 import pandas as pd
 import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from transformers import AutoConfig, AutoTokenizer, AutoModelForSequenceClassification
 import numpy as np
 from tqdm import tqdm
 
+SENTIMENT_MODEL = 'w11wo/indonesian-roberta-base-sentiment-classifier'
+
+# Kolom hasil yang dihasilkan score_texts
+RESULT_COLUMNS = ['sentiment', 'sentiment_confidence', 'prob_positif', 'prob_negatif', 'prob_netral']
+PROB_COLUMNS = {'Positif': 'prob_positif', 'Negatif': 'prob_negatif', 'Netral': 'prob_netral'}
+
+# Probabilitas default untuk teks kosong (sama dengan predict_sentiment)
+DEFAULT_PROBS = {'Positif': 0.33, 'Negatif': 0.33, 'Netral': 0.34}
+
+# Tokenizer & model yang sudah di-load, dipakai bersama oleh semua analyzer
+# dalam satu process agar model hanya di-load sekali
+_LOADED_TOKENIZERS = {}
+_LOADED_MODELS = {}
+
+
+def resolve_model_id(candidates, local_files_only=False):
+    """
+    Tentukan model yang dipakai tanpa me-load bobot model
+    
+    Hanya config model yang diambil (ringan) untuk memastikan model tersedia.
+    
+    Args:
+        candidates: List nama model Hugging Face / path lokal, urut prioritas
+        local_files_only: Jangan akses internet (pakai cache/path lokal saja)
+    
+    Returns:
+        Nama model / path pertama yang tersedia
+    """
+    for candidate in candidates:
+        try:
+            AutoConfig.from_pretrained(candidate, local_files_only=local_files_only)
+            return candidate
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] Model '{candidate}' tidak tersedia: {str(e).splitlines()[0]}")
+    
+    raise OSError(f"Tidak ada model yang tersedia dari: {candidates}")
+
+
+def model_fingerprint(model_dir):
+    """
+    Fingerprint folder model lokal (ukuran + waktu ubah config & file bobot)
+    
+    Model yang dilatih ulang ke folder yang sama (misalnya distill_student.py)
+    mendapat fingerprint baru, sehingga hasil cache model lama tidak dipakai.
+    
+    Returns:
+        String hash pendek, atau None jika model_dir bukan folder lokal
+    """
+    if not model_dir or not os.path.isdir(model_dir):
+        return None
+    
+    digest = hashlib.sha1()
+    for name in ('config.json', 'model.safetensors', 'pytorch_model.bin'):
+        path = os.path.join(model_dir, name)
+        if os.path.exists(path):
+            stat = os.stat(path)
+            digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+
+def load_tokenizer(model_id, local_files_only=False):
+    """Load tokenizer sekali per process"""
+    if model_id not in _LOADED_TOKENIZERS:
+        _LOADED_TOKENIZERS[model_id] = AutoTokenizer.from_pretrained(
+            model_id, local_files_only=local_files_only
+        )
+    return _LOADED_TOKENIZERS[model_id]
+
+
+def load_model(model_id, device, num_labels=None, local_files_only=False):
+    """Load model klasifikasi sekali per process (per model & device)"""
+    key = (model_id, str(device), num_labels)
+    if key not in _LOADED_MODELS:
+        start = time.perf_counter()
+        kwargs = {'num_labels': num_labels} if num_labels else {}
+        model = AutoModelForSequenceClassification.from_pretrained(
+            model_id, local_files_only=local_files_only, **kwargs
+        )
+        model.to(device)
+        model.eval()
+        _LOADED_MODELS[key] = model
+        print(f"[INFO] Model {model_id} di-load dalam {time.perf_counter() - start:.2f} detik")
+    return _LOADED_MODELS[key]
+
+
 class IndoBERTSentimentAnalyzer:
-    def __init__(self, model_name='indolem/indobert-base-uncased'):
+    def __init__(self, model_name='indolem/indobert-base-uncased', cache=None,
+                 backend='torch', quantize=True, onnx_dir='models/onnx',
+                 sentiment_model=SENTIMENT_MODEL, model_path=None, local_files_only=False,
+                 student_path='models/student', token_store_dir=None, thread_config_path=None,
+                 onnx_threads=None):
         """
         Initialize IndoBERT model untuk sentiment analysis
         
+        Model baru di-load saat pertama kali dipakai (lazy), dan di-load
+        hanya sekali per process meskipun analyzer dibuat berulang kali.
+        
         Args:
-            model_name: Nama model Hugging Face
+            model_name: Nama model Hugging Face fallback jika model sentimen tidak tersedia
+            cache: PredictionCache opsional, teks yang sudah pernah dianalisis tidak diprediksi ulang
+            backend: 'torch' (PyTorch), 'onnx' (ONNX Runtime CPU), atau
+                'student' (model hasil distilasi di student_path, PyTorch)
+            quantize: Pakai dynamic int8 quantization untuk backend 'onnx'
+            onnx_dir: Folder cache file hasil export ONNX
+            sentiment_model: Nama model sentimen yang sudah di-fine-tune
+            model_path: Path folder model lokal (mode offline), dipakai jika diisi
+            local_files_only: Jangan akses internet (pakai cache/path lokal saja)
+            student_path: Folder model student hasil distill_student.py
+            token_store_dir: Folder TokenStore (input ids memory-mapped), None = tokenize ulang
+            thread_config_path: File hasil thread_tuner.py, jumlah thread torch & batch size
+                diterapkan saat startup jika file ada untuk host ini
+            onnx_threads: Jumlah thread intra-op session ONNX Runtime (None = default)
         """
-        print("[INFO] Loading IndoBERT model...")
-        print(f"[INFO] Model: {model_name}")
+        # Disimpan agar worker process bisa membuat analyzer yang sama
+        self.init_kwargs = {
+            'model_name': model_name,
+            'backend': backend,
+            'quantize': quantize,
+            'onnx_dir': onnx_dir,
+            'sentiment_model': sentiment_model,
+            'model_path': model_path,
+            'local_files_only': local_files_only,
+            'student_path': student_path,
+            'token_store_dir': token_store_dir,
+            'thread_config_path': thread_config_path,
+            'onnx_threads': onnx_threads
+        }
+        
+        start = time.perf_counter()
         
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         print(f"[INFO] Using device: {self.device}")
         
-        # Load tokenizer dan model
-        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        # Thread torch & batch size hasil kalibrasi di host ini
+        self.batch_size = 16
+        if thread_config_path:
+            from thread_tuner import load_tuning, apply_tuning
+            tuning = load_tuning(thread_config_path)
+            if tuning is not None:
+                apply_tuning(tuning)
+                self.batch_size = tuning['batch_size']
         
-        # Kita akan membuat classifier sederhana
-        # Atau gunakan model pre-trained sentiment jika ada
-        try:
-            # Coba load model sentiment yang sudah di-fine-tune
-            self.model = AutoModelForSequenceClassification.from_pretrained(
-                'w11wo/indonesian-roberta-base-sentiment-classifier'
-            )
-            self.tokenizer = AutoTokenizer.from_pretrained(
-                'w11wo/indonesian-roberta-base-sentiment-classifier'
-            )
-            print("[INFO] Loaded pre-trained sentiment model")
-        except:
-            # Fallback ke IndoBERT base
-            self.model = AutoModelForSequenceClassification.from_pretrained(
-                model_name,
-                num_labels=3  # Positif, Negatif, Netral
-            )
-            print("[INFO] Using base IndoBERT model")
+        # Tentukan model dulu sebelum me-load apapun
+        if backend == 'student':
+            self.model_id = student_path
+            self.local_files_only = True
+        elif model_path:
+            self.model_id = model_path
+            self.local_files_only = True
+        else:
+            self.model_id = resolve_model_id([sentiment_model, model_name], local_files_only=local_files_only)
+            self.local_files_only = local_files_only
+        
+        # Model base (bukan model sentimen) butuh classification head 3 label
+        self.num_labels = 3  # Positif, Negatif, Netral
+        self.head_num_labels = self.num_labels if self.model_id == model_name else None
         
-        self.model.to(self.device)
-        self.model.eval()
+        print(f"[INFO] Model: {self.model_id}")
+        
+        self._tokenizer = None
+        self._model = None
         
         # Label mapping
         self.label_map = {0: 'Negatif', 1: 'Netral', 2: 'Positif'}
+        self.opinion_map = {'Positif': 'Setuju', 'Negatif': 'Tidak Setuju', 'Netral': 'Netral'}
+        
+        # Label sebagai categorical (urutan kategori = index label model)
+        self.sentiment_categories = [self.label_map[i] for i in range(self.num_labels)]
+        self.sentiment_dtype = pd.CategoricalDtype(self.sentiment_categories)
+        self.prob_columns = [PROB_COLUMNS[label] for label in self.sentiment_categories]
+        
+        self.cache = cache
+        
+        # Pool worker yang sedang terbuka (lihat worker_pool)
+        self._executor = None
+        self._executor_workers = None
         
-        print("[SUCCESS] Model loaded successfully!")
+        # Token store per max_length (hasil truncation berbeda per max_length)
+        self.token_store_dir = token_store_dir
+        self._token_stores = {}
+        
+        # Backend inferensi
+        self.backend = backend
+        self.quantize = quantize
+        self.onnx_dir = onnx_dir
+        self.onnx_threads = onnx_threads
+        self._onnx_backend = None
+        # Folder model lokal (student / model_path) diberi fingerprint agar model yang
+        # dilatih ulang ke folder yang sama tidak memakai cache prediksi / export ONNX model lama
+        self.fingerprint = model_fingerprint(self.model_id)
+        self.cache_id = f"{self.model_id}#{self.fingerprint}" if self.fingerprint else self.model_id
+        if backend == 'onnx':
+            # Hasil ONNX (terutama int8) sedikit berbeda, pisahkan entry cache-nya
+            self.cache_id = f"{self.cache_id}@onnx{'-int8' if quantize else ''}"
+        elif backend not in ('torch', 'student'):
+            raise ValueError(f"Backend tidak dikenal: {backend}")
+        
+        self.init_seconds = time.perf_counter() - start
+        print(f"[INFO] Analyzer siap dalam {self.init_seconds:.2f} detik (model di-load saat pertama dipakai)")
+    
+    @property
+    def tokenizer(self):
+        """Tokenizer, di-load saat pertama kali dipakai"""
+        if self._tokenizer is None:
+            self._tokenizer = load_tokenizer(self.model_id, local_files_only=self.local_files_only)
+        return self._tokenizer
+    
+    def get_token_store(self, max_length=512):
+        """TokenStore untuk tokenizer model ini dan max_length tertentu"""
+        if max_length not in self._token_stores:
+            from token_store import TokenStore
+            self._token_stores[max_length] = TokenStore(self.token_store_dir, self.model_id, max_length=max_length)
+        return self._token_stores[max_length]
+    
+    @property
+    def model(self):
+        """Model PyTorch, di-load saat pertama kali dipakai"""
+        if self._model is None:
+            self._model = load_model(
+                self.model_id, self.device,
+                num_labels=self.head_num_labels,
+                local_files_only=self.local_files_only
+            )
+        return self._model
+    
+    @property
+    def onnx_backend(self):
+        """Backend ONNX Runtime (None jika backend bukan 'onnx')"""
+        if self._onnx_backend is None and self.backend == 'onnx':
+            from onnx_backend import ONNXSentimentBackend
+            self._onnx_backend = ONNXSentimentBackend(
+                self.model_id, onnx_dir=self.onnx_dir, quantize=self.quantize,
+                model_loader=lambda: self.model, num_threads=self.onnx_threads,
+                fingerprint=self.fingerprint
+            )
+        return self._onnx_backend
+    
+    def warmup(self):
+        """
+        Load tokenizer & model sekarang dan jalankan satu prediksi
+        
+        Returns:
+            Waktu warmup dalam detik
+        """
+        start = time.perf_counter()
+        self.predict_sentiment("pemanasan model")
+        elapsed = time.perf_counter() - start
+        print(f"[INFO] Warmup model selesai dalam {elapsed:.2f} detik")
+        return elapsed
     
     def predict_sentiment(self, text, max_length=512):
         """
@@ -68,20 +282,8 @@ class IndoBERTSentimentAnalyzer:
                 'probabilities': {'Positif': 0.33, 'Negatif': 0.33, 'Netral': 0.34}
             }
         
-        # Tokenize
-        inputs = self.tokenizer(
-            text,
-            return_tensors='pt',
-            truncation=True,
-            max_length=max_length,
-            padding='max_length'
-        ).to(self.device)
-        
-        # Predict
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            logits = outputs.logits
-            probs = torch.softmax(logits, dim=1).cpu().numpy()[0]
+        # Tokenize & predict (tanpa padding, satu teks tidak perlu di-pad)
+        probs = self.predict_proba_batch([text], max_length=max_length)[0]
         
         # Get prediction
         pred_label = np.argmax(probs)
@@ -101,14 +303,647 @@ class IndoBERTSentimentAnalyzer:
             'probabilities': probabilities
         }
     
-    def analyze_dataframe(self, df, text_column='content', batch_size=16):
+    def predict_proba_batch(self, texts, max_length=512):
+        """
+        Prediksi probabilitas untuk satu batch teks dalam satu forward pass
+        
+        Args:
+            texts: List teks (semua harus string tidak kosong)
+            max_length: Panjang maksimal token
+        
+        Returns:
+            numpy array shape (len(texts), num_labels)
+        """
+        # Dynamic padding: pad hanya sampai teks terpanjang di batch
+        inputs = self.tokenizer(
+            list(texts),
+            return_tensors='pt',
+            truncation=True,
+            max_length=max_length,
+            padding='longest'
+        )
+        
+        return self._forward(inputs)
+    
+    def _forward(self, inputs, backend=None, return_embeddings=False):
+        """
+        Jalankan model untuk input yang sudah di-tokenize
+        
+        Returns:
+            Probabilitas, atau tuple (probabilitas, embedding) jika return_embeddings=True.
+            Embedding = mean pooling hidden state layer terakhir (token padding diabaikan)
+        """
+        backend = backend or self.backend
+        
+        if backend == 'onnx':
+            if return_embeddings:
+                raise ValueError("Embedding hanya tersedia untuk backend 'torch' dan 'student'")
+            logits = torch.from_numpy(self.onnx_backend.predict_logits(inputs))
+            return torch.softmax(logits, dim=1).numpy()
+        
+        inputs = inputs.to(self.device)
+        
+        with torch.no_grad():
+            outputs = self.model(**inputs, output_hidden_states=return_embeddings)
+            probs = torch.softmax(outputs.logits, dim=1).cpu().numpy()
+            
+            if return_embeddings:
+                mask = inputs['attention_mask'].unsqueeze(-1).to(outputs.hidden_states[-1].dtype)
+                pooled = (outputs.hidden_states[-1] * mask).sum(dim=1) / mask.sum(dim=1).clamp_min(1)
+                return probs, pooled.float().cpu().numpy()
+        
+        return probs
+    
+    def check_backend_parity(self, texts, batch_size=16, max_length=512):
+        """
+        Bandingkan hasil backend ONNX dengan backend PyTorch
+        
+        Args:
+            texts: List teks untuk pengecekan
+            batch_size: Jumlah teks per batch
+            max_length: Panjang maksimal token
+        
+        Returns:
+            dict dengan label agreement dan selisih probabilitas maksimum
+        """
+        if self.onnx_backend is None:
+            print("[ERROR] Backend ONNX tidak aktif, parity check dilewati")
+            return None
+        
+        texts = [str(text) for text in texts if isinstance(text, str) and text.strip()]
+        agree = 0
+        max_diff = 0.0
+        
+        for positions, inputs in self.iter_length_batches(texts, batch_size=batch_size, max_length=max_length):
+            probs_torch = self._forward(inputs, backend='torch')
+            probs_onnx = self._forward(inputs, backend='onnx')
+            agree += int((probs_torch.argmax(axis=1) == probs_onnx.argmax(axis=1)).sum())
+            max_diff = max(max_diff, float(np.abs(probs_torch - probs_onnx).max()))
+        
+        total = len(texts)
+        result = {
+            'total': total,
+            'agree': agree,
+            'agreement_pct': (agree / total * 100) if total > 0 else 0,
+            'max_prob_diff': max_diff
+        }
+        
+        print(f"[PARITY] Label agreement ONNX vs PyTorch: {agree}/{total} ({result['agreement_pct']:.2f}%)")
+        print(f"[PARITY] Selisih probabilitas maksimum: {max_diff:.4f}")
+        
+        return result
+    
+    def iter_length_batches(self, texts, batch_size=16, max_length=512):
+        """
+        Tokenize semua teks sekali, lalu buat batch berdasarkan panjang token
+        
+        Teks diurutkan berdasarkan panjang token sehingga setiap batch berisi
+        teks dengan panjang mirip dan padding per batch minimal. Jika
+        token_store_dir diisi, input ids dibaca dari TokenStore (memmap) dan
+        hanya teks yang belum ada di store yang di-tokenize.
+        
+        Args:
+            texts: List teks (semua harus string tidak kosong)
+            batch_size: Jumlah teks per batch
+            max_length: Panjang maksimal token
+        
+        Yields:
+            Tuple (posisi teks dalam list input, encoding batch yang sudah di-pad)
+        """
+        if len(texts) == 0:
+            return
+        
+        if self.token_store_dir:
+            store = self.get_token_store(max_length)
+            offsets, lengths = store.lookup(list(texts), self.tokenizer)
+            order = np.argsort(lengths, kind='stable')
+            
+            for start in range(0, len(order), batch_size):
+                positions = order[start:start + batch_size]
+                yield positions, store.pad_batch(offsets[positions], lengths[positions], self.tokenizer.pad_token_id)
+            return
+        
+        encodings = self.tokenizer(
+            list(texts),
+            truncation=True,
+            max_length=max_length,
+            padding=False
+        )
+        input_ids = encodings['input_ids']
+        attention_mask = encodings['attention_mask']
+        
+        lengths = np.array([len(ids) for ids in input_ids])
+        order = np.argsort(lengths, kind='stable')
+        
+        for start in range(0, len(order), batch_size):
+            positions = order[start:start + batch_size]
+            batch = self.tokenizer.pad(
+                {
+                    'input_ids': [input_ids[i] for i in positions],
+                    'attention_mask': [attention_mask[i] for i in positions]
+                },
+                padding='longest',
+                return_tensors='pt'
+            )
+            yield positions, batch
+    
+    def predict_proba_texts(self, texts, batch_size=16, max_length=512, show_progress=True,
+                            return_embeddings=False):
+        """
+        Prediksi probabilitas untuk list teks dengan batch urut panjang token
+        
+        Args:
+            texts: List teks (semua harus string tidak kosong)
+            batch_size: Jumlah teks per forward pass
+            max_length: Panjang maksimal token
+            show_progress: Tampilkan progress bar
+            return_embeddings: Kembalikan juga embedding dari forward pass yang sama
+        
+        Returns:
+            numpy array shape (len(texts), num_labels), urutan sama dengan texts,
+            atau tuple (probabilitas, embedding (len(texts), hidden_size)) jika return_embeddings=True
+        """
+        probs = np.zeros((len(texts), self.num_labels))
+        embeddings = np.zeros((len(texts), self.model.config.hidden_size), dtype=np.float32) if return_embeddings else None
+        
+        with tqdm(total=len(texts), desc="Analyzing", disable=not show_progress) as pbar:
+            for positions, inputs in self.iter_length_batches(texts, batch_size=batch_size, max_length=max_length):
+                if return_embeddings:
+                    probs[positions], embeddings[positions] = self._forward(inputs, return_embeddings=True)
+                else:
+                    probs[positions] = self._forward(inputs)
+                pbar.update(len(positions))
+        
+        if return_embeddings:
+            return probs, embeddings
+        return probs
+    
+    def embed_texts(self, texts, batch_size=16, max_length=512):
+        """Embedding untuk list teks (misalnya teks query untuk VectorStore.query)"""
+        _, embeddings = self.predict_proba_texts(
+            texts, batch_size=batch_size, max_length=max_length, show_progress=False, return_embeddings=True
+        )
+        return embeddings
+    
+    @contextmanager
+    def worker_pool(self, num_workers=None):
+        """
+        Buka pool worker yang dipakai ulang oleh semua predict_proba_parallel di dalam blok
+        
+        Setiap worker me-load model sekali untuk seluruh blok (semua chunk
+        checkpoint, grup budget token, dan window), bukan sekali per pemanggilan.
+        Jika pool sudah terbuka, pool tersebut yang dipakai.
+        
+        Args:
+            num_workers: Jumlah worker process (default: jumlah CPU)
+        
+        Yields:
+            ProcessPoolExecutor
+        """
+        num_workers = num_workers or os.cpu_count()
+        if self._executor is not None:
+            yield self._executor
+            return
+        
+        threads_per_worker = max(1, os.cpu_count() // num_workers)
+        print(f"[INFO] Membuka pool: {num_workers} worker x {threads_per_worker} thread")
+        
+        # 'spawn' agar state thread OpenMP/torch di parent tidak ikut ter-fork
+        self._executor = ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self.init_kwargs, threads_per_worker)
+        )
+        self._executor_workers = num_workers
+        try:
+            yield self._executor
+        finally:
+            self._executor.shutdown()
+            self._executor = None
+            self._executor_workers = None
+    
+    def predict_proba_parallel(self, texts, num_workers=None, batch_size=16, max_length=512,
+                               return_embeddings=False):
+        """
+        Prediksi probabilitas dengan beberapa process (sharding)
+        
+        Setiap worker me-load model sekali dengan jumlah thread torch
+        cpu_count // num_workers, lalu hasil tiap shard digabung sesuai urutan input.
+        Pool dari worker_pool yang sedang terbuka dipakai ulang.
+        
+        Args:
+            texts: List teks (semua harus string tidak kosong)
+            num_workers: Jumlah worker process (default: jumlah CPU)
+            batch_size: Jumlah teks per forward pass
+            max_length: Panjang maksimal token
+            return_embeddings: Kembalikan juga embedding (lihat predict_proba_texts)
+        
+        Returns:
+            numpy array shape (len(texts), num_labels), urutan sama dengan texts,
+            atau tuple (probabilitas, embedding) jika return_embeddings=True
+        """
+        num_workers = num_workers or os.cpu_count()
+        if len(texts) == 0:
+            if return_embeddings:
+                return np.zeros((0, self.num_labels)), np.zeros((0, self.model.config.hidden_size), dtype=np.float32)
+            return np.zeros((0, self.num_labels))
+        
+        # Tokenize semua teks di parent dulu, worker hanya membaca store (tanpa menulis)
+        if self.token_store_dir:
+            self.get_token_store(max_length).lookup(list(texts), self.tokenizer)
+        
+        results = []
+        with self.worker_pool(num_workers) as executor:
+            num_workers = self._executor_workers
+            
+            # Shard lebih kecil dari (total / worker) agar beban antar worker seimbang
+            shard_size = max(batch_size, -(-len(texts) // (num_workers * 4)))
+            shards = [texts[start:start + shard_size] for start in range(0, len(texts), shard_size)]
+            print(f"[INFO] Parallel scoring: {num_workers} worker, {len(shards)} shard")
+            
+            jobs = executor.map(
+                _score_shard, shards, [batch_size] * len(shards), [max_length] * len(shards),
+                [return_embeddings] * len(shards)
+            )
+            for shard_result in tqdm(jobs, total=len(shards), desc="Analyzing (shard)"):
+                results.append(shard_result)
+        
+        if return_embeddings:
+            return np.vstack([probs for probs, _ in results]), np.vstack([emb for _, emb in results])
+        return np.vstack(results)
+    
+    def score_texts(self, texts, batch_size=16, max_length=512, num_workers=1, verbose=True,
+                    long_text='truncate', return_embeddings=False):
+        """
+        Hitung kolom hasil sentimen untuk list teks (cache + model)
+        
+        Args:
+            texts: List teks
+            batch_size: Jumlah teks per forward pass
+            max_length: Panjang maksimal token, satu nilai atau satu nilai per teks
+            num_workers: Jumlah worker process, > 1 untuk scoring paralel
+            verbose: Tampilkan progress bar dan statistik cache
+            long_text: 'truncate' (potong di max_length) atau 'window' (teks yang lebih
+                panjang dianalisis per window kalimat lalu diagregasi, lihat score_windows)
+            return_embeddings: Kembalikan juga embedding dari forward pass yang sama. Embedding
+                tidak disimpan di cache, jadi semua teks dijalankan ke model
+        
+        Returns:
+            dict {nama kolom: numpy array} untuk sentiment, sentiment_confidence, dan prob_*,
+            atau tuple (dict, embedding (n, hidden_size)) jika return_embeddings=True
+            (embedding teks kosong bernilai nol)
+        """
+        texts = [str(text) for text in texts]
+        n = len(texts)
+        max_lengths = np.broadcast_to(np.asarray(max_length, dtype=int), (n,))
+        embeddings = np.zeros((n, self.model.config.hidden_size), dtype=np.float32) if return_embeddings else None
+        
+        # Matriks probabilitas (kolom = index label model), default untuk teks kosong
+        probs = np.tile([DEFAULT_PROBS[label] for label in self.sentiment_categories], (n, 1))
+        codes = np.full(n, self.sentiment_categories.index('Netral'), dtype=np.int8)
+        confidence = np.zeros(n)
+        
+        valid_idx = np.array([i for i, text in enumerate(texts) if text.strip()], dtype=int)
+        
+        # Ambil hasil dari cache per budget token, hanya cache miss yang dijalankan ke model
+        use_cache = self.cache is not None and not return_embeddings
+        if use_cache and len(valid_idx) > 0:
+            hit_mask = np.zeros(len(valid_idx), dtype=bool)
+            for budget in np.unique(max_lengths[valid_idx]):
+                group = np.flatnonzero(max_lengths[valid_idx] == budget)
+                cached = self.cache.get_many(
+                    [texts[i] for i in valid_idx[group]], self.make_cache_id(budget, long_text)
+                )
+                if not cached:
+                    continue
+                hit_positions = group[list(cached.keys())]
+                hit_idx = valid_idx[hit_positions]
+                cached_frame = pd.DataFrame(list(cached.values()), columns=RESULT_COLUMNS)
+                codes[hit_idx] = pd.Categorical(cached_frame['sentiment'], dtype=self.sentiment_dtype).codes
+                confidence[hit_idx] = cached_frame['sentiment_confidence'].to_numpy()
+                probs[hit_idx] = cached_frame[self.prob_columns].to_numpy()
+                hit_mask[hit_positions] = True
+            valid_idx = valid_idx[~hit_mask]
+            if verbose:
+                print(f"[CACHE] {hit_mask.sum()} data diambil dari cache, {len(valid_idx)} data dianalisis model")
+        
+        # Semua cache miss (termasuk teks panjang) disimpan ke cache setelah dianalisis
+        scored_idx = valid_idx
+        
+        # Teks yang melebihi budget token: hasil per window. Token hanya dihitung
+        # untuk cache miss, teks yang sudah di-cache tidak di-tokenize ulang
+        if long_text == 'window' and len(valid_idx) > 0:
+            long_mask = self.count_tokens([texts[i] for i in valid_idx]) > max_lengths[valid_idx]
+            long_idx = valid_idx[long_mask]
+            if len(long_idx) > 0:
+                if verbose:
+                    print(f"[INFO] {len(long_idx)} teks melebihi budget token, dianalisis per window")
+                window_scores = self.score_windows(
+                    [texts[i] for i in long_idx], max_lengths[long_idx],
+                    batch_size=batch_size, num_workers=num_workers, return_embeddings=return_embeddings
+                )
+                if return_embeddings:
+                    probs[long_idx], embeddings[long_idx] = window_scores
+                else:
+                    probs[long_idx] = window_scores
+                codes[long_idx] = probs[long_idx].argmax(axis=1)
+                confidence[long_idx] = probs[long_idx].max(axis=1)
+                valid_idx = valid_idx[~long_mask]
+        
+        # Dijalankan per budget token agar teks pendek mendapat batch kecil & cepat
+        model_texts = [texts[i] for i in valid_idx]
+        model_probs = np.zeros((len(valid_idx), self.num_labels))
+        for budget in np.unique(max_lengths[valid_idx]):
+            group = np.flatnonzero(max_lengths[valid_idx] == budget)
+            group_texts = [model_texts[i] for i in group]
+            if num_workers and num_workers > 1:
+                group_scores = self.predict_proba_parallel(
+                    group_texts, num_workers=num_workers, batch_size=batch_size, max_length=int(budget),
+                    return_embeddings=return_embeddings
+                )
+            else:
+                group_scores = self.predict_proba_texts(
+                    group_texts, batch_size=batch_size, max_length=int(budget), show_progress=verbose,
+                    return_embeddings=return_embeddings
+                )
+            if return_embeddings:
+                model_probs[group], embeddings[valid_idx[group]] = group_scores
+            else:
+                model_probs[group] = group_scores
+        
+        # Hasil ditulis kembali ke posisi baris aslinya, argmax untuk seluruh array sekaligus
+        if len(valid_idx) > 0:
+            probs[valid_idx] = model_probs
+            codes[valid_idx] = model_probs.argmax(axis=1)
+            confidence[valid_idx] = model_probs.max(axis=1)
+        
+        results = self.build_result_columns(probs, codes, confidence)
+        
+        if use_cache:
+            for budget in np.unique(max_lengths[scored_idx]):
+                group_idx = scored_idx[max_lengths[scored_idx] == budget]
+                self.cache.put_many(
+                    [texts[i] for i in group_idx],
+                    self.make_cache_id(budget, long_text),
+                    zip(*(np.asarray(results[column])[group_idx] for column in RESULT_COLUMNS))
+                )
+            if verbose:
+                self.cache.print_stats()
+        
+        if return_embeddings:
+            return results, embeddings
+        return results
+    
+    def make_cache_id(self, max_length, long_text='truncate'):
+        """
+        Id cache untuk satu budget token
+        
+        Hasil berbeda per max_length (truncation) dan per mode long_text (teks
+        panjang di-window atau dipotong), jadi keduanya ikut dalam key cache.
+        """
+        suffix = '-window' if long_text == 'window' else ''
+        return f"{self.cache_id}@{int(max_length)}{suffix}"
+    
+    def count_tokens(self, texts):
+        """Jumlah token tiap teks (termasuk special token, tanpa truncation)"""
+        if len(texts) == 0:
+            return np.zeros(0, dtype=int)
+        encodings = self.tokenizer(list(texts), add_special_tokens=True, truncation=False)
+        return np.array([len(ids) for ids in encodings['input_ids']])
+    
+    def split_windows(self, text, max_length=512):
+        """
+        Pecah teks panjang menjadi window yang masing-masing muat dalam max_length token
+        
+        Kalimat utuh digabung berurutan sampai budget penuh, sehingga perubahan
+        pada satu bagian artikel hanya mengubah window di sekitarnya. Kalimat yang
+        lebih panjang dari budget dipotong per token.
+        
+        Args:
+            text: Teks panjang
+            max_length: Panjang maksimal token per window (termasuk special token)
+        
+        Returns:
+            List tuple (teks window, jumlah token window)
+        """
+        budget = max(1, max_length - self.tokenizer.num_special_tokens_to_add())
+        
+        pieces = []
+        for sentence in re.split(r'(?<=[.!?])\s+', text.strip()):
+            ids = self.tokenizer(sentence, add_special_tokens=False)['input_ids']
+            if len(ids) <= budget:
+                pieces.append((sentence, len(ids)))
+            else:
+                for start in range(0, len(ids), budget):
+                    piece = ids[start:start + budget]
+                    pieces.append((self.tokenizer.decode(piece), len(piece)))
+        
+        windows = []
+        current, current_len = [], 0
+        for piece, piece_len in pieces:
+            if current and current_len + piece_len > budget:
+                windows.append((' '.join(current), current_len))
+                current, current_len = [], 0
+            if piece_len > 0:
+                current.append(piece)
+                current_len += piece_len
+        if current:
+            windows.append((' '.join(current), current_len))
+        
+        return windows
+    
+    def score_windows(self, texts, max_lengths, batch_size=16, num_workers=1, return_embeddings=False):
+        """
+        Probabilitas teks panjang dari rata-rata window (dibobot jumlah token)
+        
+        Window dianalisis lewat score_texts sehingga hasil tiap window masuk
+        cache: artikel yang diedit hanya menganalisis ulang window yang berubah.
+        
+        Args:
+            texts: List teks panjang
+            max_lengths: Budget token per teks
+            batch_size: Jumlah teks per forward pass
+            num_workers: Jumlah worker process, > 1 untuk scoring paralel
+            return_embeddings: Kembalikan juga embedding (rata-rata embedding window)
+        
+        Returns:
+            numpy array shape (len(texts), num_labels), atau tuple (probabilitas, embedding)
+        """
+        windows, owners, weights = [], [], []
+        for i, (text, budget) in enumerate(zip(texts, max_lengths)):
+            for window, n_tokens in self.split_windows(text, int(budget)):
+                windows.append(window)
+                owners.append(i)
+                weights.append(n_tokens)
+        
+        owners = np.array(owners, dtype=int)
+        weights = np.array(weights, dtype=float)
+        
+        window_results = self.score_texts(
+            windows, batch_size=batch_size, max_length=np.asarray(max_lengths)[owners],
+            num_workers=num_workers, verbose=False, return_embeddings=return_embeddings
+        )
+        if return_embeddings:
+            window_results, window_embeddings = window_results
+        window_probs = np.column_stack([window_results[column] for column in self.prob_columns])
+        
+        total = np.bincount(owners, weights=weights, minlength=len(texts))[:, None]
+        
+        weighted = np.zeros((len(texts), self.num_labels))
+        np.add.at(weighted, owners, window_probs * weights[:, None])
+        
+        if return_embeddings:
+            pooled = np.zeros((len(texts), window_embeddings.shape[1]), dtype=np.float32)
+            np.add.at(pooled, owners, window_embeddings * weights[:, None])
+            return weighted / total, pooled / total
+        return weighted / total
+    
+    def build_result_columns(self, probs, codes, confidence):
+        """
+        Bangun kolom hasil dari matriks probabilitas
+        
+        Args:
+            probs: numpy array (n, num_labels), kolom = index label model
+            codes: Index label terpilih per baris
+            confidence: Confidence per baris
+        
+        Returns:
+            dict {nama kolom: array} urut RESULT_COLUMNS, 'sentiment' berupa Categorical
+        """
+        prob_by_column = {column: probs[:, k] for k, column in enumerate(self.prob_columns)}
+        
+        results = {
+            'sentiment': pd.Categorical.from_codes(codes, dtype=self.sentiment_dtype),
+            'sentiment_confidence': confidence
+        }
+        for column in RESULT_COLUMNS[2:]:
+            results[column] = prob_by_column[column]
+        
+        return results
+    
+    def add_opinion_column(self, df):
+        """Ubah kolom 'sentiment' menjadi categorical dan tambahkan kolom 'opinion'"""
+        df['sentiment'] = df['sentiment'].astype(self.sentiment_dtype)
+        df['opinion'] = df['sentiment'].cat.rename_categories(self.opinion_map)
+        return df
+    
+    def make_row_keys(self, df, text_column='content', id_column=None):
+        """
+        Buat identitas baris untuk checkpoint
+        
+        Pakai id_column jika diisi, jika tidak pakai index DataFrame + hash teks
+        sehingga baris yang isinya berubah tidak dianggap sudah dianalisis.
+        """
+        if id_column:
+            return df[id_column].astype(str).tolist()
+        
+        return [
+            f"{index}:{hashlib.sha1(str(text).encode('utf-8')).hexdigest()[:16]}"
+            for index, text in zip(df.index, df[text_column])
+        ]
+    
+    def score_with_checkpoint(self, texts, row_keys, checkpoint_path, resume=True,
+                              checkpoint_every=500, batch_size=16, max_length=512, num_workers=1,
+                              long_text='truncate'):
+        """
+        Scoring dengan checkpoint berkala ke file CSV lokal
+        
+        Setiap checkpoint_every baris, hasilnya di-append ke checkpoint_path.
+        Jika proses terhenti, run berikutnya dengan resume=True melewati baris
+        yang sudah ada di checkpoint. Model/backend dan mode teks panjang
+        dicatat di file .meta.json, checkpoint dari konfigurasi lain dibuang;
+        baris yang budget tokennya berubah dianalisis ulang.
+        
+        Args:
+            texts: List teks
+            row_keys: Identitas tiap baris (lihat make_row_keys)
+            checkpoint_path: Path file checkpoint CSV
+            resume: Lanjutkan dari checkpoint yang ada (False = mulai dari awal)
+            checkpoint_every: Jumlah baris per checkpoint
+            batch_size: Jumlah teks per forward pass
+            max_length: Panjang maksimal token, satu nilai atau satu nilai per teks
+            num_workers: Jumlah worker process, > 1 untuk scoring paralel
+            long_text: Mode teks yang melebihi max_length (lihat score_texts)
+        
+        Returns:
+            dict {nama kolom: numpy array} seperti score_texts
+        """
+        texts = [str(text) for text in texts]
+        n = len(texts)
+        max_lengths = np.broadcast_to(np.asarray(max_length, dtype=int), (n,))
+        results = {
+            column: np.empty(n, dtype=object) if column == 'sentiment' else np.zeros(n)
+            for column in RESULT_COLUMNS
+        }
+        done = np.zeros(n, dtype=bool)
+        
+        directory = os.path.dirname(checkpoint_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        
+        meta_path = checkpoint_path + '.meta.json'
+        fingerprint = {'cache_id': self.cache_id, 'long_text': long_text}
+        
+        if resume and os.path.exists(checkpoint_path):
+            saved_fingerprint = None
+            if os.path.exists(meta_path):
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    saved_fingerprint = json.load(f)
+            if saved_fingerprint != fingerprint:
+                print(f"[WARNING] Checkpoint {checkpoint_path} dibuat dengan model/konfigurasi lain "
+                      f"({saved_fingerprint}), mulai dari awal")
+                resume = False
+        
+        if resume and os.path.exists(checkpoint_path):
+            # Baris terakhir bisa terpotong jika proses mati saat menulis
+            saved = pd.read_csv(checkpoint_path, on_bad_lines='skip', dtype={'row_key': str}).dropna()
+            saved = saved.drop_duplicates(subset='row_key', keep='last').set_index('row_key')
+            
+            positions = saved.index.get_indexer(pd.Index(row_keys).astype(str))
+            done = positions >= 0
+            # Baris dengan budget token berbeda dari checkpoint dianalisis ulang
+            done[done] = saved['max_length'].to_numpy()[positions[done]] == max_lengths[done]
+            for column in RESULT_COLUMNS:
+                results[column][done] = saved[column].to_numpy()[positions[done]]
+            
+            print(f"[CHECKPOINT] Resume dari {checkpoint_path}: {int(done.sum())} data sudah dianalisis")
+        else:
+            if os.path.exists(checkpoint_path):
+                os.remove(checkpoint_path)
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump(fingerprint, f)
+        
+        todo = np.flatnonzero(~done)
+        for start in tqdm(range(0, len(todo), checkpoint_every), desc="Analyzing (checkpoint)"):
+            idx = todo[start:start + checkpoint_every]
+            chunk = self.score_texts(
+                [texts[i] for i in idx], batch_size=batch_size, max_length=max_lengths[idx],
+                num_workers=num_workers, verbose=False, long_text=long_text
+            )
+            for column in RESULT_COLUMNS:
+                results[column][idx] = chunk[column]
+            
+            pd.DataFrame({'row_key': [row_keys[i] for i in idx], 'max_length': max_lengths[idx], **chunk}).to_csv(
+                checkpoint_path, mode='a', header=not os.path.exists(checkpoint_path), index=False
+            )
+        
+        if self.cache is not None:
+            self.cache.print_stats()
+        
+        return results
+    
+    def analyze_dataframe(self, df, text_column='content', batch_size=16, max_length=512, num_workers=1,
+                          checkpoint_path=None, resume=True, checkpoint_every=500, id_column=None,
+                          keep_checkpoint=False, source_column='source', max_length_by_source=None,
+                          long_text='truncate', vector_store=None):
         """
         Analisis sentimen untuk DataFrame
         
         Args:
             df: DataFrame dengan kolom text
             text_column: Nama kolom yang berisi teks
-            batch_size: Ukuran batch untuk processing
+            (argumen lain: lihat score_dataframe)
         
         Returns:
             DataFrame dengan kolom sentimen tambahan
@@ -120,24 +955,106 @@ class IndoBERTSentimentAnalyzer:
             print(f"[ERROR] Kolom '{text_column}' tidak ditemukan!")
             return df
         
-        results = []
-        
-        # Process dengan progress bar
-        for idx, text in tqdm(enumerate(df[text_column]), total=len(df), desc="Analyzing"):
-            result = self.predict_sentiment(str(text))
-            results.append(result)
+        results = self.score_dataframe(
+            df, text_column=text_column, batch_size=batch_size, max_length=max_length,
+            num_workers=num_workers, checkpoint_path=checkpoint_path, resume=resume,
+            checkpoint_every=checkpoint_every, id_column=id_column, keep_checkpoint=keep_checkpoint,
+            source_column=source_column, max_length_by_source=max_length_by_source,
+            long_text=long_text, vector_store=vector_store
+        )
         
         # Tambahkan hasil ke DataFrame
-        df['sentiment'] = [r['sentiment'] for r in results]
-        df['sentiment_confidence'] = [r['confidence'] for r in results]
-        df['prob_positif'] = [r['probabilities']['Positif'] for r in results]
-        df['prob_negatif'] = [r['probabilities']['Negatif'] for r in results]
-        df['prob_netral'] = [r['probabilities']['Netral'] for r in results]
+        for column, values in results.items():
+            df[column] = values
         
         # Tentukan opinion berdasarkan sentimen
-        df['opinion'] = df['sentiment'].apply(self.get_opinion_label)
+        self.add_opinion_column(df)
+        
+        self.print_distribution(df)
+        
+        print(f"\n[SUCCESS] Analisis selesai untuk {len(df)} data")
+        
+        return df
+    
+    def score_dataframe(self, df, text_column='content', batch_size=16, max_length=512, num_workers=1,
+                        checkpoint_path=None, resume=True, checkpoint_every=500, id_column=None,
+                        keep_checkpoint=False, source_column='source', max_length_by_source=None,
+                        long_text='truncate', vector_store=None):
+        """
+        Hitung kolom hasil sentimen untuk DataFrame (tanpa mengubah df)
+        
+        Dipakai analyze_dataframe dan tier IndoBERT CascadeSentimentAnalyzer.
         
-        # Print distribusi
+        Args:
+            df: DataFrame dengan kolom text
+            text_column: Nama kolom yang berisi teks
+            batch_size: Jumlah teks per forward pass
+            max_length: Panjang maksimal token
+            num_workers: Jumlah worker process, > 1 untuk scoring paralel
+            checkpoint_path: Path file checkpoint, None = tanpa checkpoint
+            resume: Lanjutkan dari checkpoint yang ada
+            checkpoint_every: Jumlah baris per checkpoint
+            id_column: Kolom identitas baris untuk checkpoint (default: index + hash teks)
+            keep_checkpoint: Simpan file checkpoint setelah analisis selesai
+            source_column: Kolom sumber data untuk max_length_by_source
+            max_length_by_source: dict {sumber: max_length}, sumber lain memakai max_length
+            long_text: 'truncate' atau 'window' untuk teks yang melebihi budget token
+            vector_store: VectorStore opsional, embedding tiap baris disimpan dengan
+                row id dari make_row_keys (dari forward pass yang sama)
+        
+        Returns:
+            dict {nama kolom: numpy array} seperti score_texts, urutan sama dengan df
+        """
+        # Budget token per baris berdasarkan sumber data
+        if max_length_by_source and source_column in df.columns:
+            max_length = (
+                df[source_column].map(max_length_by_source).fillna(max_length).astype(int).to_numpy()
+            )
+            budgets = pd.Series(max_length).value_counts().sort_index()
+            print(f"[INFO] Budget token per baris: {', '.join(f'{b} ({c} data)' for b, c in budgets.items())}")
+        
+        if vector_store is not None and checkpoint_path:
+            print("[WARNING] Checkpoint tidak dipakai saat menyimpan embedding ke vector store")
+            checkpoint_path = None
+        
+        # Satu pool untuk semua chunk checkpoint & grup budget token
+        with self.worker_pool(num_workers) if num_workers and num_workers > 1 else nullcontext():
+            if vector_store is not None:
+                results, embeddings = self.score_texts(
+                    df[text_column], batch_size=batch_size, max_length=max_length, num_workers=num_workers,
+                    long_text=long_text, return_embeddings=True
+                )
+                row_keys = np.asarray(self.make_row_keys(df, text_column=text_column, id_column=id_column), dtype=str)
+                valid = df[text_column].astype(str).str.strip().ne('').to_numpy()
+                vector_store.add(row_keys[valid], embeddings[valid], model_id=self.model_id)
+                print(f"[SAVE] {int(valid.sum())} embedding disimpan ke vector store: {vector_store.path}")
+            elif checkpoint_path:
+                results = self.score_with_checkpoint(
+                    df[text_column],
+                    self.make_row_keys(df, text_column=text_column, id_column=id_column),
+                    checkpoint_path,
+                    resume=resume,
+                    checkpoint_every=checkpoint_every,
+                    batch_size=batch_size,
+                    max_length=max_length,
+                    num_workers=num_workers,
+                    long_text=long_text
+                )
+            else:
+                results = self.score_texts(
+                    df[text_column], batch_size=batch_size, max_length=max_length, num_workers=num_workers,
+                    long_text=long_text
+                )
+        
+        if checkpoint_path and not keep_checkpoint:
+            for path in (checkpoint_path, checkpoint_path + '.meta.json'):
+                if os.path.exists(path):
+                    os.remove(path)
+        
+        return results
+    
+    def print_distribution(self, df):
+        """Print distribusi sentimen dan opini"""
         sentiment_dist = df['sentiment'].value_counts()
         opinion_dist = df['opinion'].value_counts()
         
@@ -150,19 +1067,61 @@ class IndoBERTSentimentAnalyzer:
         print(f"   Setuju      : {opinion_dist.get('Setuju', 0)}")
         print(f"   Tidak Setuju: {opinion_dist.get('Tidak Setuju', 0)}")
         print(f"   Netral      : {opinion_dist.get('Netral', 0)}")
+    
+    def analyze_iter(self, texts_or_chunks, text_column='content', chunk_size=256,
+                     batch_size=16, max_length=512, as_records=False):
+        """
+        Analisis sentimen secara streaming (generator)
         
-        print(f"\n[SUCCESS] Analisis selesai untuk {len(df)} data")
+        Input bisa berupa iterable teks atau iterable DataFrame chunk
+        (misalnya pd.read_csv(..., chunksize=1000)). Hasil di-yield per chunk
+        begitu selesai dianalisis, sehingga bisa langsung ditulis ke CSV/MySQL
+        dan memori tetap kecil berapapun ukuran korpusnya.
         
-        return df
-    
-    def get_opinion_label(self, sentiment):
-        """Konversi sentimen ke opini"""
-        if sentiment == 'Positif':
-            return 'Setuju'
-        elif sentiment == 'Negatif':
-            return 'Tidak Setuju'
-        else:
-            return 'Netral'
+        Args:
+            texts_or_chunks: Iterable teks, DataFrame, atau iterable DataFrame
+            text_column: Nama kolom teks pada DataFrame (juga nama kolom output untuk input teks)
+            chunk_size: Jumlah teks per chunk untuk input berupa teks
+            batch_size: Jumlah teks per forward pass
+            max_length: Panjang maksimal token
+            as_records: Yield dict per baris, bukan DataFrame per chunk
+        
+        Yields:
+            DataFrame chunk dengan kolom sentimen, atau dict per baris jika as_records=True
+        """
+        if isinstance(texts_or_chunks, str):
+            texts_or_chunks = [texts_or_chunks]
+        elif isinstance(texts_or_chunks, pd.DataFrame):
+            frame = texts_or_chunks
+            texts_or_chunks = (frame.iloc[start:start + chunk_size] for start in range(0, len(frame), chunk_size))
+        
+        def score_chunk(chunk):
+            results = self.score_texts(
+                chunk[text_column], batch_size=batch_size, max_length=max_length, verbose=False
+            )
+            for column, values in results.items():
+                chunk[column] = values
+            self.add_opinion_column(chunk)
+            
+            if as_records:
+                return chunk.to_dict('records')
+            return [chunk]
+        
+        buffer = []
+        for item in texts_or_chunks:
+            if isinstance(item, pd.DataFrame):
+                if buffer:
+                    yield from score_chunk(pd.DataFrame({text_column: buffer}))
+                    buffer = []
+                yield from score_chunk(item.copy())
+            else:
+                buffer.append(item)
+                if len(buffer) >= chunk_size:
+                    yield from score_chunk(pd.DataFrame({text_column: buffer}))
+                    buffer = []
+        
+        if buffer:
+            yield from score_chunk(pd.DataFrame({text_column: buffer}))
     
     def get_sentiment_summary(self, df):
         """Dapatkan ringkasan statistik sentimen"""
@@ -199,6 +1158,28 @@ class IndoBERTSentimentAnalyzer:
         }
 
 
+# Analyzer per worker process, di-load sekali oleh _init_worker
+_worker_analyzer = None
+
+
+def _init_worker(init_kwargs, num_threads):
+    """Initializer worker: set jumlah thread torch lalu load model sekali"""
+    global _worker_analyzer
+    torch.set_num_threads(num_threads)
+    # Jumlah thread worker sudah ditentukan parent, hasil tuning tidak dipakai
+    _worker_analyzer = IndoBERTSentimentAnalyzer(**{
+        **init_kwargs, 'thread_config_path': None, 'onnx_threads': num_threads
+    })
+
+
+def _score_shard(texts, batch_size, max_length, return_embeddings=False):
+    """Scoring satu shard teks di worker process"""
+    return _worker_analyzer.predict_proba_texts(
+        texts, batch_size=batch_size, max_length=max_length, show_progress=False,
+        return_embeddings=return_embeddings
+    )
+
+
 def main():
     """Testing IndoBERT analyzer"""
     print("="*70)
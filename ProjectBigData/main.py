@@ -36,12 +36,14 @@ def create_directories():
             os.makedirs(directory)
             print(f"[INFO] Folder '{directory}' dibuat")
 
-def train_prediction_model(df):
+def train_prediction_model(df, model_path=None, word_corpus=None):
     """
     Melatih model prediksi sentimen menggunakan Naive Bayes
     
     Args:
         df: DataFrame dengan kolom 'processed_text' dan 'sentiment'
+        model_path: Path untuk menyimpan model (dipakai mode cascade), None = tidak disimpan
+        word_corpus: WordCorpus processed_text (index sama dengan df), None = TF-IDF dari string
     
     Returns:
         Model terlatih dan vectorizer
@@ -69,9 +71,14 @@ def train_prediction_model(df):
     print(f"[INFO] Data training: {len(X_train)} | Data testing: {len(X_test)}")
     
     # Vectorize text
-    vectorizer = TfidfVectorizer(max_features=500, min_df=2)
-    X_train_vec = vectorizer.fit_transform(X_train)
-    X_test_vec = vectorizer.transform(X_test)
+    if word_corpus is not None:
+        # TF-IDF langsung dari id kata (hasil sama, processed_text tidak di-split ulang)
+        vectorizer, X_train_vec = word_corpus.select(X_train.index).fit_tfidf(max_features=500, min_df=2)
+        X_test_vec = word_corpus.select(X_test.index).transform_tfidf(vectorizer)
+    else:
+        vectorizer = TfidfVectorizer(max_features=500, min_df=2)
+        X_train_vec = vectorizer.fit_transform(X_train)
+        X_test_vec = vectorizer.transform(X_test)
     
     # Train model
     model = MultinomialNB()
@@ -85,6 +92,10 @@ def train_prediction_model(df):
     print("\n[RESULT] Classification Report:")
     print(classification_report(y_test, y_pred, zero_division=0))
     
+    if model_path:
+        from cascade_analyzer import save_fast_model
+        save_fast_model(model, vectorizer, model_path)
+    
     return model, vectorizer
 
 def predict_future_sentiment(summary):
@@ -301,19 +312,102 @@ def main():
     from data_cleaner import DataCleaner
     
     cleaner = DataCleaner()
-    df_cleaned = cleaner.clean_data(df_raw)
     
     # 2B. Text Preprocessing
-    preprocessor = TextPreprocessor()
-    df_processed = preprocessor.preprocess_dataframe(df_cleaned)
+    preprocessor = TextPreprocessor(
+        stem_cache_path=config.STEM_CACHE_PATH,
+        stem_cache_size=config.STEM_CACHE_MAX_ENTRIES,
+        store_path=config.PREPROCESS_STORE_PATH
+    )
+    
+    if config.PREPROCESS_CHUNK_SIZE:
+        # Mode streaming: raw_data.csv dibaca per chunk, data mentah tidak disimpan di memori
+        del df_raw
+        preprocessor.preprocess_csv(
+            raw_data_path,
+            config.PREPROCESSED_DATA_PATH,
+            chunk_size=config.PREPROCESS_CHUNK_SIZE,
+            num_workers=config.PREPROCESS_NUM_WORKERS,
+            cleaner=cleaner
+        )
+        df_processed = pd.read_csv(config.PREPROCESSED_DATA_PATH, encoding='utf-8-sig')
+    else:
+        df_cleaned = cleaner.clean_data(df_raw)
+        df_processed = preprocessor.preprocess_dataframe(df_cleaned, num_workers=config.PREPROCESS_NUM_WORKERS)
+    
+    # 2C. Vocabulary + id kata (dipakai TF-IDF model prediksi & word cloud)
+    word_corpus = None
+    if config.WORD_CORPUS_ENABLED:
+        from word_corpus import WordCorpus
+        
+        word_corpus = WordCorpus.from_texts(df_processed['processed_text'])
+        word_corpus.print_stats()
+        if config.WORD_CORPUS_PATH:
+            word_corpus.save(config.WORD_CORPUS_PATH)
     
     # ===== TAHAP 3: ANALISIS SENTIMEN =====
     print("\n" + "="*70)
     print("TAHAP 3: ANALISIS SENTIMEN")
     print("="*70)
     
-    analyzer = IndoBERTSentimentAnalyzer()
-    df_final = analyzer.analyze_dataframe(df_processed)
+    cache = None
+    if config.SENTIMENT_CACHE_ENABLED:
+        from prediction_cache import PredictionCache
+        cache = PredictionCache(
+            db_path=config.SENTIMENT_CACHE_PATH,
+            max_entries=config.SENTIMENT_CACHE_MAX_ENTRIES
+        )
+    
+    analyzer = IndoBERTSentimentAnalyzer(
+        cache=cache,
+        backend=config.SENTIMENT_BACKEND,
+        quantize=config.ONNX_QUANTIZE,
+        onnx_dir=config.ONNX_MODEL_DIR,
+        model_path=config.SENTIMENT_MODEL_PATH,
+        local_files_only=config.SENTIMENT_OFFLINE,
+        student_path=config.STUDENT_MODEL_PATH,
+        token_store_dir=config.TOKEN_STORE_DIR,
+        thread_config_path=config.THREAD_TUNING_PATH
+    )
+    fast_model, fast_vectorizer = None, None
+    if config.CASCADE_ENABLED:
+        from cascade_analyzer import CascadeSentimentAnalyzer, load_fast_model
+        fast_model, fast_vectorizer = load_fast_model(config.FAST_MODEL_PATH)
+        if fast_model is None:
+            print(f"[INFO] Model cepat belum ada di {config.FAST_MODEL_PATH}, cascade dilewati untuk run ini")
+    
+    if fast_model is not None:
+        cascade = CascadeSentimentAnalyzer(
+            analyzer, fast_model, fast_vectorizer, threshold=config.CASCADE_THRESHOLD
+        )
+        df_final = cascade.analyze_dataframe(
+            df_processed,
+            batch_size=analyzer.batch_size,
+            max_length=config.SENTIMENT_MAX_LENGTH,
+            num_workers=config.SENTIMENT_NUM_WORKERS,
+            checkpoint_path=config.SENTIMENT_CHECKPOINT_PATH,
+            checkpoint_every=config.SENTIMENT_CHECKPOINT_EVERY,
+            max_length_by_source=config.SENTIMENT_MAX_LENGTH_BY_SOURCE,
+            long_text=config.SENTIMENT_LONG_TEXT_MODE
+        )
+    else:
+        vector_store = None
+        if config.VECTOR_STORE_PATH:
+            from vector_store import VectorStore
+            vector_store = VectorStore(config.VECTOR_STORE_PATH)
+            vector_store.clear()  # Dibangun ulang sejajar dengan processed_data.csv
+        
+        df_final = analyzer.analyze_dataframe(
+            df_processed,
+            batch_size=analyzer.batch_size,
+            max_length=config.SENTIMENT_MAX_LENGTH,
+            num_workers=config.SENTIMENT_NUM_WORKERS,
+            checkpoint_path=config.SENTIMENT_CHECKPOINT_PATH,
+            checkpoint_every=config.SENTIMENT_CHECKPOINT_EVERY,
+            max_length_by_source=config.SENTIMENT_MAX_LENGTH_BY_SOURCE,
+            long_text=config.SENTIMENT_LONG_TEXT_MODE,
+            vector_store=vector_store
+        )
     
     # Simpan processed data
     processed_data_path = 'data/processed_data.csv'
@@ -364,10 +458,19 @@ def main():
         predict_future_sentiment(summary)
     
     # ===== TAHAP 5: TRAINING MODEL PREDIKSI =====
-    try:
-        model, vectorizer = train_prediction_model(df_final)
-    except Exception as e:
-        print(f"[WARNING] Gagal training model: {str(e)}")
+    if 'sentiment_tier' in df_final.columns:
+        # Run cascade: sebagian besar label berasal dari model cepat sendiri, dan baris IndoBERT
+        # hanya data yang paling tidak yakin. Melatih ulang dari sini membuat model cepat makin bias,
+        # jadi model cepat hanya dilatih dari run IndoBERT penuh (CASCADE_ENABLED = False).
+        print("[INFO] Run cascade: model cepat tidak dilatih ulang "
+              f"(jalankan tanpa cascade untuk memperbarui {config.FAST_MODEL_PATH})")
+    else:
+        try:
+            model, vectorizer = train_prediction_model(
+                df_final, model_path=config.FAST_MODEL_PATH, word_corpus=word_corpus
+            )
+        except Exception as e:
+            print(f"[WARNING] Gagal training model: {str(e)}")
     
     # ===== TAHAP 6: VISUALISASI =====
     print("\n" + "="*70)
@@ -375,7 +478,9 @@ def main():
     print("="*70)
     
     visualizer = SentimentVisualizer()
-    visualizer.create_all_visualizations(df_final, show=True)
+    visualizer.create_all_visualizations(
+        df_final, show=True, word_corpus=word_corpus if config.WORDCLOUD_FROM_CORPUS else None
+    )
     
     # ===== TAHAP 7: SIMPAN KE MYSQL DATABASE (BARU!) =====
     print("\n" + "="*70)
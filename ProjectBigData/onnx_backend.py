@@ -0,0 +1,129 @@
+# onnx_backend.py
+"""
+Backend ONNX Runtime (CPU) untuk model sentimen, dengan opsi kuantisasi int8
+"""
+
+import os
+import numpy as np
+import torch
+
+
+class ONNXSentimentBackend:
+    def __init__(self, model_id, onnx_dir='models/onnx', quantize=True, model_loader=None, num_threads=None,
+                 fingerprint=None):
+        """
+        Initialize backend ONNX Runtime
+
+        Model di-export ke ONNX sekali, lalu file hasil export dipakai ulang
+        pada run berikutnya (model PyTorch tidak perlu di-load lagi).
+
+        Args:
+            model_id: Nama model, dipakai untuk nama file hasil export
+            onnx_dir: Folder penyimpanan file ONNX
+            quantize: Terapkan dynamic int8 quantization
+            model_loader: Fungsi yang mengembalikan model PyTorch sumber export,
+                hanya dipanggil jika file ONNX belum ada
+            num_threads: Jumlah thread intra-op session (None = default ONNX Runtime);
+                torch.set_num_threads tidak berpengaruh ke ONNX Runtime
+            fingerprint: Fingerprint folder model lokal (model_fingerprint), masuk ke nama
+                file export sehingga model yang dilatih ulang di-export ulang
+        """
+        import onnxruntime as ort
+
+        self.model_id = model_id
+        self.onnx_dir = onnx_dir
+        self.quantize = quantize
+
+        # exist_ok: beberapa worker process bisa membuat folder ini bersamaan
+        os.makedirs(onnx_dir, exist_ok=True)
+
+        base_name = model_id.strip('/').replace('/', '__')
+        if fingerprint:
+            base_name = f'{base_name}.{fingerprint}'
+        self.fp32_path = os.path.join(onnx_dir, f'{base_name}.onnx')
+        self.int8_path = os.path.join(onnx_dir, f'{base_name}.int8.onnx')
+        model_path = self.int8_path if quantize else self.fp32_path
+
+        # Worker process bisa sampai di sini bersamaan: hanya satu yang export,
+        # yang lain menunggu lock lalu memakai file yang sudah jadi
+        if not os.path.exists(model_path):
+            from token_store import file_lock
+
+            with file_lock(os.path.join(onnx_dir, f'{base_name}.lock')):
+                if not os.path.exists(self.fp32_path):
+                    if model_loader is None:
+                        raise FileNotFoundError(f"File ONNX belum ada dan model sumber tidak diberikan: {self.fp32_path}")
+                    self.export(model_loader())
+                if quantize and not os.path.exists(self.int8_path):
+                    self.quantize_model()
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+
+        self.session = ort.InferenceSession(model_path, sess_options=options, providers=['CPUExecutionProvider'])
+        self.input_names = [inp.name for inp in self.session.get_inputs()]
+        print(f"[INFO] ONNX Runtime backend aktif: {model_path}")
+
+    @staticmethod
+    def temp_path(path):
+        """Path sementara per process, di-rename ke path setelah file selesai ditulis"""
+        root, ext = os.path.splitext(path)
+        return f'{root}.{os.getpid()}.tmp{ext}'
+
+    def export(self, model):
+        """Export model PyTorch ke ONNX dengan sumbu batch & sequence dinamis"""
+        print(f"[INFO] Export model ke ONNX: {self.fp32_path}")
+        temp_path = self.temp_path(self.fp32_path)
+
+        model = model.to('cpu').eval()
+        dummy_ids = torch.ones((2, 8), dtype=torch.long)
+        dummy_mask = torch.ones((2, 8), dtype=torch.long)
+
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                (dummy_ids, dummy_mask),
+                temp_path,
+                input_names=['input_ids', 'attention_mask'],
+                output_names=['logits'],
+                dynamic_axes={
+                    'input_ids': {0: 'batch', 1: 'sequence'},
+                    'attention_mask': {0: 'batch', 1: 'sequence'},
+                    'logits': {0: 'batch'}
+                },
+                opset_version=17,
+                dynamo=False
+            )
+
+        os.replace(temp_path, self.fp32_path)
+        print("[SUCCESS] Export ONNX selesai")
+
+    def quantize_model(self):
+        """Dynamic int8 quantization untuk bobot linear (MatMul)"""
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+
+        print(f"[INFO] Kuantisasi int8: {self.int8_path}")
+        temp_path = self.temp_path(self.int8_path)
+        quantize_dynamic(self.fp32_path, temp_path, weight_type=QuantType.QInt8)
+        os.replace(temp_path, self.int8_path)
+        print("[SUCCESS] Kuantisasi selesai")
+
+    def predict_logits(self, inputs):
+        """
+        Jalankan inferensi ONNX Runtime
+
+        Args:
+            inputs: Encoding tokenizer (tensor PyTorch atau numpy)
+
+        Returns:
+            numpy array logits shape (batch, num_labels)
+        """
+        feeds = {}
+        for name in self.input_names:
+            value = inputs[name]
+            if isinstance(value, torch.Tensor):
+                value = value.cpu().numpy()
+            feeds[name] = np.asarray(value, dtype=np.int64)
+
+        return self.session.run(['logits'], feeds)[0]
\ No newline at end of file
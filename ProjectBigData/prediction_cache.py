@@ -0,0 +1,190 @@
+# prediction_cache.py
+"""
+Cache prediksi sentimen di disk (SQLite) agar teks yang sama tidak dianalisis ulang
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+
+
+class PredictionCache:
+    def __init__(self, db_path='data/sentiment_cache.db', max_entries=200000):
+        """
+        Initialize cache prediksi
+
+        Args:
+            db_path: Path file SQLite untuk cache
+            max_entries: Jumlah maksimal entry, entry paling lama tidak dipakai akan dihapus
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS predictions (
+                key TEXT PRIMARY KEY,
+                sentiment TEXT NOT NULL,
+                confidence REAL NOT NULL,
+                prob_positif REAL NOT NULL,
+                prob_negatif REAL NOT NULL,
+                prob_netral REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_last_access ON predictions (last_access)"
+        )
+        self.connection.commit()
+
+    @staticmethod
+    def normalize_text(text):
+        """Normalisasi teks sebelum di-hash (hapus whitespace berlebih)"""
+        return ' '.join(str(text).split())
+
+    def make_key(self, text, model_id):
+        """Buat key cache dari hash teks ternormalisasi + model id"""
+        payload = f"{model_id}\n{self.normalize_text(text)}"
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get_many(self, texts, model_id):
+        """
+        Ambil hasil prediksi dari cache
+
+        Args:
+            texts: List teks
+            model_id: Nama model yang dipakai untuk prediksi
+
+        Returns:
+            dict {posisi dalam texts: (sentiment, confidence, prob_positif, prob_negatif, prob_netral)}
+        """
+        keys = [self.make_key(text, model_id) for text in texts]
+        found = {}
+
+        # Query per chunk agar tidak melebihi batas variabel SQLite
+        unique_keys = list(set(keys))
+        for start in range(0, len(unique_keys), 500):
+            chunk = unique_keys[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.connection.execute(
+                f"SELECT key, sentiment, confidence, prob_positif, prob_negatif, prob_netral "
+                f"FROM predictions WHERE key IN ({placeholders})",
+                chunk
+            ).fetchall()
+            for row in rows:
+                found[row[0]] = tuple(row[1:])
+
+        if found:
+            now = time.time()
+            self.connection.executemany(
+                "UPDATE predictions SET last_access = ? WHERE key = ?",
+                [(now, key) for key in found]
+            )
+            self.connection.commit()
+
+        results = {pos: found[key] for pos, key in enumerate(keys) if key in found}
+        self.hits += len(results)
+        self.misses += len(keys) - len(results)
+
+        return results
+
+    def put_many(self, texts, model_id, rows):
+        """
+        Simpan hasil prediksi ke cache
+
+        Args:
+            texts: List teks
+            model_id: Nama model yang dipakai untuk prediksi
+            rows: List tuple (sentiment, confidence, prob_positif, prob_negatif, prob_netral)
+        """
+        now = time.time()
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO predictions "
+            "(key, sentiment, confidence, prob_positif, prob_negatif, prob_netral, last_access) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (self.make_key(text, model_id), str(row[0]), float(row[1]),
+                 float(row[2]), float(row[3]), float(row[4]), now)
+                for text, row in zip(texts, rows)
+            ]
+        )
+        self.connection.commit()
+        self.evict()
+
+    def evict(self):
+        """Hapus entry paling lama tidak dipakai jika jumlah entry melebihi max_entries"""
+        if not self.max_entries:
+            return 0
+
+        excess = len(self) - self.max_entries
+        if excess <= 0:
+            return 0
+
+        self.connection.execute(
+            "DELETE FROM predictions WHERE key IN "
+            "(SELECT key FROM predictions ORDER BY last_access ASC LIMIT ?)",
+            (excess,)
+        )
+        self.connection.commit()
+
+        return excess
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+    def get_stats(self):
+        """Statistik cache (hit, miss, hit rate, jumlah entry)"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / total * 100) if total > 0 else 0,
+            'entries': len(self),
+            'max_entries': self.max_entries
+        }
+
+    def print_stats(self):
+        """Print statistik cache"""
+        stats = self.get_stats()
+        print(f"[CACHE] Hit: {stats['hits']} | Miss: {stats['misses']} | Hit rate: {stats['hit_rate']:.1f}%")
+        print(f"[CACHE] Entry tersimpan: {stats['entries']} (maks {stats['max_entries']})")
+
+    def clear(self):
+        """Hapus semua isi cache"""
+        self.connection.execute("DELETE FROM predictions")
+        self.connection.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        """Tutup koneksi SQLite"""
+        self.connection.close()
+
+
+def main():
+    """Testing prediction cache"""
+    cache = PredictionCache(db_path='data/test_sentiment_cache.db', max_entries=2)
+    cache.clear()
+
+    texts = ["Naturalisasi bagus", "Saya tidak setuju", "Pemain berlatih"]
+    rows = [
+        ('Positif', 0.9, 0.9, 0.05, 0.05),
+        ('Negatif', 0.8, 0.1, 0.8, 0.1),
+        ('Netral', 0.7, 0.15, 0.15, 0.7)
+    ]
+
+    cache.put_many(texts, 'test-model', rows)
+    print(f"Hasil cache: {cache.get_many(texts, 'test-model')}")
+    cache.print_stats()
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,168 @@
+# preprocess_store.py
+"""
+Store hasil preprocessing di disk (SQLite), key = hash teks mentah
+
+Baris yang tidak berubah sejak run sebelumnya tidak perlu di-preprocess
+ulang. Store diberi fingerprint versi preprocessing (daftar stopwords,
+versi Sastrawi) dan otomatis dikosongkan jika fingerprint berubah.
+"""
+
+import hashlib
+import os
+import sqlite3
+
+
+class PreprocessStore:
+    def __init__(self, db_path='data/preprocess_store.db', fingerprint=''):
+        """
+        Initialize preprocess store
+
+        Args:
+            db_path: Path file SQLite
+            fingerprint: Fingerprint versi preprocessing (TextPreprocessor.get_fingerprint)
+        """
+        self.db_path = db_path
+        self.fingerprint = fingerprint
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS processed (
+                key TEXT PRIMARY KEY,
+                processed_text TEXT NOT NULL
+            )
+        """)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                name TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        """)
+        self.connection.commit()
+
+        self.check_fingerprint()
+
+    def check_fingerprint(self):
+        """Kosongkan store jika dibuat dengan versi preprocessing lain"""
+        row = self.connection.execute("SELECT value FROM meta WHERE name = 'fingerprint'").fetchone()
+        if row is not None and row[0] == self.fingerprint:
+            return
+
+        if row is not None and len(self):
+            print(f"[WARNING] Stopwords / versi stemmer berubah, preprocess store {self.db_path} dikosongkan")
+            self.connection.execute("DELETE FROM processed")
+
+        self.connection.execute(
+            "INSERT OR REPLACE INTO meta (name, value) VALUES ('fingerprint', ?)",
+            (self.fingerprint,)
+        )
+        self.connection.commit()
+
+    @staticmethod
+    def make_key(text):
+        """Key store: hash teks mentah (tanpa normalisasi, cleaning peka terhadap isi teks)"""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def get_many(self, texts):
+        """
+        Ambil hasil preprocessing dari store
+
+        Args:
+            texts: List teks mentah (nilai non-string dilewati)
+
+        Returns:
+            dict {posisi dalam texts: processed_text}
+        """
+        keys = {pos: self.make_key(text) for pos, text in enumerate(texts) if isinstance(text, str)}
+        found = {}
+
+        # Query per chunk agar tidak melebihi batas variabel SQLite
+        unique_keys = list(set(keys.values()))
+        for start in range(0, len(unique_keys), 500):
+            chunk = unique_keys[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.connection.execute(
+                f"SELECT key, processed_text FROM processed WHERE key IN ({placeholders})",
+                chunk
+            ).fetchall()
+            found.update(rows)
+
+        results = {pos: found[key] for pos, key in keys.items() if key in found}
+        self.hits += len(results)
+        self.misses += len(texts) - len(results)
+
+        return results
+
+    def put_many(self, texts, processed_texts):
+        """
+        Simpan hasil preprocessing ke store
+
+        Args:
+            texts: List teks mentah (nilai non-string dilewati)
+            processed_texts: List hasil preprocessing, sejajar dengan texts
+        """
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO processed (key, processed_text) VALUES (?, ?)",
+            [
+                (self.make_key(text), str(processed))
+                for text, processed in zip(texts, processed_texts)
+                if isinstance(text, str)
+            ]
+        )
+        self.connection.commit()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM processed").fetchone()[0]
+
+    def get_stats(self):
+        """Statistik store (hit, miss, hit rate, jumlah entry)"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / total * 100) if total > 0 else 0,
+            'entries': len(self)
+        }
+
+    def print_stats(self):
+        """Print statistik store"""
+        stats = self.get_stats()
+        print(f"[STORE] Hit: {stats['hits']} | Miss: {stats['misses']} | Hit rate: {stats['hit_rate']:.1f}%")
+        print(f"[STORE] Teks tersimpan: {stats['entries']}")
+
+    def clear(self):
+        """Hapus semua isi store"""
+        self.connection.execute("DELETE FROM processed")
+        self.connection.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        """Tutup koneksi SQLite"""
+        self.connection.close()
+
+
+def main():
+    """Testing preprocess store"""
+    store = PreprocessStore(db_path='data/test_preprocess_store.db', fingerprint='test-v1')
+    store.clear()
+
+    texts = ["Pemain bermain bola", "Saya tidak setuju"]
+    store.put_many(texts, ['main', 'setuju'])
+    print(f"Hasil store: {store.get_many(texts + ['Teks baru'])}")
+    store.print_stats()
+    store.close()
+
+    # Fingerprint berbeda -> store dikosongkan
+    store = PreprocessStore(db_path='data/test_preprocess_store.db', fingerprint='test-v2')
+    print(f"Entry setelah fingerprint berubah: {len(store)}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,357 @@
+# sentiment_server.py
+"""
+Server HTTP lokal (asyncio) untuk analisis sentimen ad-hoc
+
+Satu model tetap ter-load per host: dashboard dan script lain cukup memanggil
+server ini lewat SentimentClient. Request yang datang bersamaan digabung
+menjadi satu micro-batch (dibatasi ukuran batch dan waktu tunggu maksimal).
+
+Endpoint:
+    POST /predict  {"text": "..."} atau {"texts": ["...", ...]}
+    GET  /health   status server & model
+    GET  /metrics  jumlah request, ukuran batch, dan latency (p50/p95/p99)
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import requests
+
+import config
+
+HTTP_STATUS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+class MicroBatcher:
+    def __init__(self, analyzer_factory, max_batch_size=32, max_wait_ms=10, max_length=512):
+        """
+        Initialize micro-batcher
+
+        Args:
+            analyzer_factory: Fungsi tanpa argumen yang mengembalikan IndoBERTSentimentAnalyzer,
+                dipanggil di thread inferensi (koneksi SQLite cache terikat ke thread pembuatnya)
+            max_batch_size: Jumlah teks maksimal per micro-batch
+            max_wait_ms: Waktu tunggu maksimal sejak teks pertama masuk sebelum batch dijalankan
+            max_length: Panjang maksimal token
+        """
+        self.analyzer_factory = analyzer_factory
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_length = max_length
+
+        self.analyzer = None
+        self.queue = None
+        # Satu thread inferensi: model dan cache hanya disentuh dari thread ini
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+        self.started_at = time.time()
+        self.total_requests = 0
+        self.total_texts = 0
+        self.total_batches = 0
+        self.latencies = deque(maxlen=1000)
+        self.batch_sizes = deque(maxlen=1000)
+
+    async def start(self):
+        """Load model (di thread inferensi) lalu jalankan loop batching"""
+        loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+        self.analyzer = await loop.run_in_executor(self.executor, self._load_analyzer)
+        self.task = asyncio.create_task(self._batch_loop())
+
+    def _load_analyzer(self):
+        analyzer = self.analyzer_factory()
+        analyzer.warmup()
+        return analyzer
+
+    async def predict(self, texts):
+        """
+        Masukkan teks ke antrian dan tunggu hasilnya
+
+        Args:
+            texts: List teks dari satu request
+
+        Returns:
+            List dict hasil per teks
+        """
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            await self.queue.put((text, future))
+            futures.append(future)
+
+        results = await asyncio.gather(*futures)
+        self.total_requests += 1
+        return results
+
+    async def _batch_loop(self):
+        """Ambil teks dari antrian sampai batch penuh atau batas waktu tunggu habis"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            texts = [text for text, _ in batch]
+            try:
+                records = await loop.run_in_executor(self.executor, self._score, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), record in zip(batch, records):
+                if not future.done():
+                    future.set_result(record)
+
+            self.total_batches += 1
+            self.total_texts += len(batch)
+            self.batch_sizes.append(len(batch))
+
+    def _score(self, texts):
+        """Scoring satu micro-batch (jalan di thread inferensi)"""
+        results = self.analyzer.score_texts(
+            texts, batch_size=self.max_batch_size, max_length=self.max_length, verbose=False
+        )
+        sentiments = np.asarray(results['sentiment'], dtype=object)
+
+        records = []
+        for i, text in enumerate(texts):
+            sentiment = sentiments[i]
+            record = {
+                'text': text,
+                'sentiment': sentiment,
+                'opinion': self.analyzer.opinion_map.get(sentiment, 'Netral')
+            }
+            for column in list(results.keys())[1:]:
+                record[column] = float(results[column][i])
+            records.append(record)
+
+        return records
+
+    def get_health(self):
+        """Status server"""
+        return {
+            'status': 'ok' if self.analyzer is not None else 'loading',
+            'model': self.analyzer.model_id if self.analyzer is not None else None,
+            'backend': self.analyzer.backend if self.analyzer is not None else None,
+            'uptime_sec': round(time.time() - self.started_at, 1),
+            'queue_size': self.queue.qsize() if self.queue is not None else 0
+        }
+
+    def get_metrics(self):
+        """Statistik request, ukuran batch, dan latency (1000 request terakhir)"""
+        latencies_ms = np.array(self.latencies) * 1000
+
+        def percentile(q):
+            return round(float(np.percentile(latencies_ms, q)), 2) if len(latencies_ms) else None
+
+        return {
+            'requests': self.total_requests,
+            'texts': self.total_texts,
+            'batches': self.total_batches,
+            'avg_batch_size': round(float(np.mean(self.batch_sizes)), 2) if self.batch_sizes else 0,
+            'latency_p50_ms': percentile(50),
+            'latency_p95_ms': percentile(95),
+            'latency_p99_ms': percentile(99),
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000
+        }
+
+
+class SentimentServer:
+    def __init__(self, batcher, host='127.0.0.1', port=8765):
+        """
+        Initialize server HTTP
+
+        Args:
+            batcher: MicroBatcher
+            host: Alamat bind (default hanya lokal)
+            port: Port server
+        """
+        self.batcher = batcher
+        self.host = host
+        self.port = port
+
+    async def handle_connection(self, reader, writer):
+        """Tangani satu koneksi HTTP (satu request, lalu koneksi ditutup)"""
+        try:
+            request_line = (await reader.readline()).decode('latin-1').strip()
+            if not request_line:
+                writer.close()
+                return
+            method, path = request_line.split(' ')[:2]
+
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1').strip()
+                if not line:
+                    break
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            body = b''
+            if int(headers.get('content-length', 0)) > 0:
+                body = await reader.readexactly(int(headers['content-length']))
+
+            status, payload = await self.route(method, path.split('?')[0], body)
+        except (ValueError, json.JSONDecodeError) as e:
+            status, payload = 400, {'error': str(e)}
+        except Exception as e:
+            print(f"[ERROR] Request gagal: {str(e)}")
+            status, payload = 500, {'error': str(e)}
+
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        writer.write(
+            f"HTTP/1.1 {status} {HTTP_STATUS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: close\r\n\r\n".encode('latin-1') + data
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def route(self, method, path, body):
+        """Routing endpoint, return (status code, payload JSON)"""
+        if path == '/health':
+            return 200, self.batcher.get_health()
+        if path == '/metrics':
+            return 200, self.batcher.get_metrics()
+        if path != '/predict':
+            return 404, {'error': f'Endpoint tidak ditemukan: {path}'}
+        if method != 'POST':
+            return 405, {'error': 'Gunakan POST untuk /predict'}
+        if self.batcher.analyzer is None:
+            return 503, {'error': 'Model belum siap'}
+
+        request = json.loads(body.decode('utf-8') or '{}')
+        texts = request.get('texts')
+        if texts is None and 'text' in request:
+            texts = [request['text']]
+        if not isinstance(texts, list):
+            return 400, {'error': "Body harus berisi 'text' atau 'texts' (list)"}
+
+        start = time.perf_counter()
+        results = await self.batcher.predict([str(text) for text in texts])
+        self.batcher.latencies.append(time.perf_counter() - start)
+
+        return 200, {'results': results}
+
+    async def serve(self):
+        """Load model lalu layani request sampai dihentikan"""
+        await self.batcher.start()
+        server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        print(f"[INFO] Sentiment server berjalan di http://{self.host}:{self.port}")
+        print(f"[INFO] Micro-batch: maks {self.batcher.max_batch_size} teks / {self.batcher.max_wait * 1000:.0f} ms")
+
+        async with server:
+            await server.serve_forever()
+
+
+class SentimentClient:
+    def __init__(self, base_url=None, timeout=60):
+        """
+        Client untuk sentiment server
+
+        Args:
+            base_url: URL server (default dari config)
+            timeout: Timeout request dalam detik
+        """
+        self.base_url = (base_url or f"http://{config.SENTIMENT_SERVER_HOST}:{config.SENTIMENT_SERVER_PORT}").rstrip('/')
+        self.timeout = timeout
+
+    def predict(self, texts):
+        """
+        Analisis sentimen lewat server
+
+        Args:
+            texts: Satu teks atau list teks
+
+        Returns:
+            dict hasil (untuk satu teks) atau list dict (untuk list teks)
+        """
+        single = isinstance(texts, str)
+        response = requests.post(
+            f"{self.base_url}/predict",
+            json={'texts': [texts] if single else list(texts)},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        results = response.json()['results']
+        return results[0] if single else results
+
+    def health(self):
+        """Status server, None jika server tidak bisa dihubungi"""
+        try:
+            response = requests.get(f"{self.base_url}/health", timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+        except requests.RequestException:
+            return None
+
+    def metrics(self):
+        """Metrics server"""
+        response = requests.get(f"{self.base_url}/metrics", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+
+def main():
+    """Jalankan sentiment server dari command line"""
+    parser = argparse.ArgumentParser(description='Server analisis sentimen lokal (micro-batching)')
+    parser.add_argument('--host', default=config.SENTIMENT_SERVER_HOST)
+    parser.add_argument('--port', type=int, default=config.SENTIMENT_SERVER_PORT)
+    parser.add_argument('--max-batch-size', type=int, default=config.SENTIMENT_SERVER_MAX_BATCH)
+    parser.add_argument('--max-wait-ms', type=float, default=config.SENTIMENT_SERVER_MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    def build_analyzer():
+        from indobert_analyzer import IndoBERTSentimentAnalyzer
+
+        cache = None
+        if config.SENTIMENT_CACHE_ENABLED:
+            from prediction_cache import PredictionCache
+            cache = PredictionCache(
+                db_path=config.SENTIMENT_CACHE_PATH,
+                max_entries=config.SENTIMENT_CACHE_MAX_ENTRIES
+            )
+
+        return IndoBERTSentimentAnalyzer(
+            cache=cache,
+            backend=config.SENTIMENT_BACKEND,
+            quantize=config.ONNX_QUANTIZE,
+            onnx_dir=config.ONNX_MODEL_DIR,
+            model_path=config.SENTIMENT_MODEL_PATH,
+            local_files_only=config.SENTIMENT_OFFLINE,
+            student_path=config.STUDENT_MODEL_PATH,
+            token_store_dir=config.TOKEN_STORE_DIR,
+            thread_config_path=config.THREAD_TUNING_PATH
+        )
+
+    batcher = MicroBatcher(build_analyzer, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+    server = SentimentServer(batcher, host=args.host, port=args.port)
+
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        print("\n[INFO] Sentiment server dihentikan")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
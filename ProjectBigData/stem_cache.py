@@ -0,0 +1,148 @@
+# stem_cache.py
+"""
+Cache stemming per kata (LRU) untuk Sastrawi, disimpan ke disk antar run
+
+Kosakata korpus hanya beberapa ribu kata unik, sehingga hampir semua kata
+cukup di-stem sekali lalu diambil dari cache.
+"""
+
+import json
+import os
+from collections import OrderedDict
+from importlib import metadata
+from Sastrawi.Stemmer.Filter import TextNormalizer
+
+
+def get_sastrawi_version():
+    """Versi Sastrawi terpasang (hasil stemming bisa berubah antar versi)"""
+    try:
+        return metadata.version('Sastrawi')
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+class StemCache:
+    def __init__(self, stemmer, path=None, max_entries=100000):
+        """
+        Initialize stem cache
+
+        Args:
+            stemmer: Stemmer Sastrawi tanpa cache (punya method stem_word)
+            path: File JSON cache, None = hanya di memori
+            max_entries: Jumlah kata maksimal (kata paling lama tidak dipakai dibuang)
+        """
+        self.stemmer = stemmer
+        self.path = path
+        self.max_entries = max_entries
+        self.version = get_sastrawi_version()
+
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        self.load()
+
+    def load(self):
+        """Load cache dari disk jika ada dan dibuat dengan versi Sastrawi yang sama"""
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+
+        if saved.get('version') != self.version:
+            print(f"[WARNING] Stem cache {self.path} dibuat dengan Sastrawi {saved.get('version')}, cache diabaikan")
+            return
+
+        self.entries = OrderedDict(saved.get('entries', {}))
+        self.evict()
+        print(f"[INFO] Stem cache di-load: {len(self.entries)} kata")
+
+    def save(self):
+        """Simpan cache ke disk (urutan LRU ikut tersimpan)"""
+        if not self.path:
+            return
+
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.version, 'entries': self.entries}, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    def evict(self):
+        """Buang kata paling lama tidak dipakai jika melebihi max_entries"""
+        while self.max_entries and len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def stem_word(self, word):
+        """Stem satu kata (sudah dinormalisasi), pakai cache jika ada"""
+        stem = self.entries.get(word)
+        if stem is not None:
+            self.entries.move_to_end(word)
+            self.hits += 1
+            return stem
+
+        self.misses += 1
+        stem = self.stemmer.stem_word(word)
+        self.entries[word] = stem
+        self.evict()
+        return stem
+
+    def stem(self, text):
+        """
+        Stem teks per kata (hasil sama dengan stemmer.stem Sastrawi)
+
+        Args:
+            text: Teks yang akan di-stem
+
+        Returns:
+            Teks hasil stemming
+        """
+        words = TextNormalizer.normalize_text(text).split(' ')
+        return ' '.join([self.stem_word(word) for word in words])
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get_stats(self):
+        """Statistik cache (hit, miss, hit rate, jumlah kata)"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / total * 100) if total > 0 else 0,
+            'entries': len(self),
+            'max_entries': self.max_entries
+        }
+
+    def print_stats(self):
+        """Print statistik cache"""
+        stats = self.get_stats()
+        print(f"[STEM CACHE] Hit: {stats['hits']} | Miss: {stats['misses']} | Hit rate: {stats['hit_rate']:.1f}%")
+        print(f"[STEM CACHE] Kata tersimpan: {stats['entries']} (maks {stats['max_entries']})")
+
+    def clear(self):
+        """Hapus semua isi cache"""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def main():
+    """Testing stem cache"""
+    from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+
+    stemmer = StemmerFactory().create_stemmer().delegatedStemmer
+    cache = StemCache(stemmer, max_entries=1000)
+
+    for text in ['pemain bermain permainan', 'permainan dimainkan pemain']:
+        print(f"{text} -> {cache.stem(text)}")
+
+    cache.print_stats()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,22 +1,90 @@
 # text_preprocessor.py
+import hashlib
+import json
+import multiprocessing
+import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
 from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
 from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
 import config
+from preprocess_store import PreprocessStore
+from stem_cache import StemCache, get_sastrawi_version
+
+# Naikkan jika logika clean_text / stopword / stemming berubah (preprocess store dikosongkan)
+PREPROCESS_VERSION = 1
+
+# Pola regex clean_text, di-compile sekali
+URL_PATTERN = re.compile(r'http\S+|www\S+|https\S+', flags=re.MULTILINE)
+MENTION_PATTERN = re.compile(r'@\w+|#\w+')
+DIGIT_PATTERN = re.compile(r'\d+')
+NON_LETTER_PATTERN = re.compile(r'[^a-z\s]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+MULTI_SPACE_PATTERN = re.compile(r' {2,}')
+
+
+class CleanCharTable(dict):
+    """
+    Tabel str.translate yang menggabungkan langkah hapus angka dan hapus
+    karakter spesial clean_text: angka dihapus, huruf a-z tetap, whitespace
+    dan karakter lain menjadi spasi biasa. Klasifikasi karakter memakai pola
+    regex yang sama, lalu disimpan (tiap karakter hanya dicek sekali).
+    """
+    def __missing__(self, code):
+        char = chr(code)
+        if DIGIT_PATTERN.fullmatch(char):
+            value = None
+        elif NON_LETTER_PATTERN.fullmatch(char) or WHITESPACE_PATTERN.fullmatch(char):
+            value = ' '
+        else:
+            value = code
+        self[code] = value
+        return value
+
+
+CLEAN_CHAR_TABLE = CleanCharTable()
+
 
 class TextPreprocessor:
-    def __init__(self):
+    def __init__(self, stem_cache_path=None, stem_cache_size=100000, store_path=None):
+        """
+        Initialize preprocessor
+        
+        Args:
+            stem_cache_path: File cache stemming per kata, None = cache hanya di memori
+            stem_cache_size: Jumlah kata maksimal di cache stemming
+            store_path: File SQLite hasil preprocessing per teks, None = preprocess ulang tiap run
+        """
         # Inisialisasi Sastrawi stemmer
         factory = StemmerFactory()
         self.stemmer = factory.create_stemmer()
         
-        # Inisialisasi stopword remover
+        # Cache stemming per kata (LRU, bisa disimpan antar run)
+        self.stem_cache = StemCache(self.stemmer.delegatedStemmer, path=stem_cache_path, max_entries=stem_cache_size)
+        
+        # Daftar stopword Sastrawi (dicek langsung lewat self.stopwords, tanpa StopWordRemover)
         stop_factory = StopWordRemoverFactory()
-        self.stopword_remover = stop_factory.create_stop_word_remover()
         
         # Tambahkan stopwords domain-specific
         self.additional_stopwords = set(config.DOMAIN_STOPWORDS)
+        
+        # Stopwords Sastrawi + domain dalam satu set (lookup O(1) per kata)
+        self.stopwords = frozenset(stop_factory.get_stop_words()) | frozenset(self.additional_stopwords)
+        
+        # Store hasil preprocessing (hanya teks baru / berubah yang diproses)
+        self.store = PreprocessStore(store_path, fingerprint=self.get_fingerprint()) if store_path else None
+    
+    def get_fingerprint(self):
+        """Fingerprint versi preprocessing: stopwords, versi Sastrawi, PREPROCESS_VERSION"""
+        payload = json.dumps({
+            'version': PREPROCESS_VERSION,
+            'sastrawi': get_sastrawi_version(),
+            'stopwords': sorted(self.stopwords)
+        })
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
     
     def clean_text(self, text):
         """
@@ -35,25 +103,52 @@ class TextPreprocessor:
         text = text.lower()
         
         # Hapus URL
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+        text = URL_PATTERN.sub('', text)
         
         # Hapus mention dan hashtag
-        text = re.sub(r'@\w+|#\w+', '', text)
+        text = MENTION_PATTERN.sub('', text)
         
         # Hapus angka
-        text = re.sub(r'\d+', '', text)
+        text = DIGIT_PATTERN.sub('', text)
         
         # Hapus karakter spesial dan tanda baca, simpan hanya huruf dan spasi
-        text = re.sub(r'[^a-z\s]', ' ', text)
+        text = NON_LETTER_PATTERN.sub(' ', text)
         
         # Hapus whitespace berlebih
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = WHITESPACE_PATTERN.sub(' ', text).strip()
         
         return text
     
+    def clean_series(self, texts):
+        """
+        Versi vectorized clean_text untuk satu kolom (hasil identik dengan clean_text)
+        
+        URL dan mention tetap dihapus berurutan (urutan mempengaruhi hasil),
+        sedangkan hapus angka, hapus karakter spesial, dan normalisasi
+        whitespace digabung menjadi satu str.translate, sehingga langkah
+        terakhir cukup meringkas spasi ganda.
+        
+        Args:
+            texts: Series teks (nilai non-string menjadi string kosong)
+        
+        Returns:
+            Series teks yang sudah dibersihkan, index sama dengan input
+        """
+        # dtype object: metode .str memakai modul re Python (semantik \w, \d, \s sama)
+        texts = pd.Series(texts, dtype=object)
+        is_text = texts.map(lambda text: isinstance(text, str)).astype(bool)
+        
+        cleaned = texts.where(is_text, '').str.lower()
+        cleaned = cleaned.str.replace(URL_PATTERN, '', regex=True)
+        cleaned = cleaned.str.replace(MENTION_PATTERN, '', regex=True)
+        cleaned = cleaned.str.translate(CLEAN_CHAR_TABLE)
+        cleaned = cleaned.str.replace(MULTI_SPACE_PATTERN, ' ', regex=True).str.strip(' ')
+        
+        return cleaned
+    
     def remove_stopwords(self, text):
         """
-        Menghapus stopwords bahasa Indonesia
+        Menghapus stopwords bahasa Indonesia (Sastrawi + domain)
         
         Args:
             text: Teks yang akan diproses
@@ -61,14 +156,43 @@ class TextPreprocessor:
         Returns:
             Teks tanpa stopwords
         """
-        # Gunakan Sastrawi stopword remover
-        text = self.stopword_remover.remove(text)
+        return ' '.join([word for word in text.split() if word not in self.stopwords])
+    
+    def remove_stopwords_and_stem(self, text):
+        """
+        Hapus stopwords lalu stemming dengan satu kali split
+        
+        Args:
+            text: Teks hasil clean_text (huruf a-z dan spasi)
+        
+        Returns:
+            Teks hasil preprocessing, sama dengan stem_text(remove_stopwords(text))
+        """
+        stem_word = self.stem_cache.stem_word
+        return ' '.join([stem_word(word) for word in text.split() if word not in self.stopwords])
+    
+    def remove_stopwords_and_stem_series(self, texts):
+        """
+        Versi vectorized remove_stopwords_and_stem untuk satu kolom
+        
+        Semua teks dipecah sekali (explode), stopwords dibuang dengan isin,
+        dan setiap kata unik di kolom hanya di-stem sekali.
+        
+        Args:
+            texts: Series teks hasil clean_series
+        
+        Returns:
+            Series teks hasil preprocessing, index sama dengan input
+        """
+        texts = pd.Series(texts, dtype=object)
+        
+        words = texts.reset_index(drop=True).str.split().explode()
+        words = words[words.notna() & ~words.isin(self.stopwords)]
         
-        # Hapus stopwords tambahan
-        words = text.split()
-        words = [word for word in words if word not in self.additional_stopwords]
+        stems = {word: self.stem_cache.stem_word(word) for word in words.unique()}
+        joined = words.map(stems).groupby(level=0).agg(' '.join)
         
-        return ' '.join(words)
+        return pd.Series(joined.reindex(range(len(texts)), fill_value='').to_numpy(), index=texts.index)
     
     def stem_text(self, text):
         """
@@ -80,7 +204,7 @@ class TextPreprocessor:
         Returns:
             Teks hasil stemming
         """
-        return self.stemmer.stem(text)
+        return self.stem_cache.stem(text)
     
     def preprocess(self, text):
         """
@@ -95,20 +219,128 @@ class TextPreprocessor:
         # 1. Bersihkan teks
         text = self.clean_text(text)
         
-        # 2. Hapus stopwords
-        text = self.remove_stopwords(text)
-        
-        # 3. Stemming
-        text = self.stem_text(text)
+        # 2. Hapus stopwords & 3. Stemming (satu kali split)
+        text = self.remove_stopwords_and_stem(text)
         
         return text
     
-    def preprocess_dataframe(self, df):
+    def preprocess_cleaned_parallel(self, texts, num_workers=None):
+        """
+        Hapus stopwords + stemming untuk teks yang sudah dibersihkan, dengan beberapa process
+        
+        Setiap worker membuat stemmer Sastrawi sendiri sekali, diawali isi stem
+        cache process ini. Kata baru hasil stemming worker digabung kembali ke
+        stem cache sehingga tetap tersimpan ke disk.
+        
+        Args:
+            texts: List teks hasil clean_text / clean_series
+            num_workers: Jumlah worker process (default: jumlah CPU)
+        
+        Returns:
+            List teks hasil preprocessing, urutan sama dengan texts
+        """
+        num_workers = num_workers or os.cpu_count()
+        if len(texts) == 0:
+            return []
+        
+        # Shard lebih kecil dari (total / worker) agar beban antar worker seimbang
+        shard_size = max(1, -(-len(texts) // (num_workers * 4)))
+        shards = [texts[start:start + shard_size] for start in range(0, len(texts), shard_size)]
+        
+        print(f"[INFO] Preprocessing paralel: {num_workers} worker, {len(shards)} shard")
+        
+        results = []
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(dict(self.stem_cache.entries), self.stem_cache.max_entries)
+        ) as executor:
+            for processed, new_stems, hits, misses in executor.map(_preprocess_shard, shards):
+                results.extend(processed)
+                for word, stem in new_stems.items():
+                    self.stem_cache.entries[word] = stem
+                self.stem_cache.hits += hits
+                self.stem_cache.misses += misses
+        
+        self.stem_cache.evict()
+        return results
+    
+    def preprocess_unique(self, texts, num_workers=1):
+        """
+        Preprocess teks unik saja lalu hasilnya disebar kembali ke setiap baris
+        
+        Kolom di-factorize dua kali: teks mentah (duplikat persis) dan teks
+        hasil cleaning (teks berbeda yang sama setelah URL/mention/angka
+        dihapus), sehingga stopword & stemming hanya jalan sekali per teks.
+        Teks mentah yang sudah ada di preprocess store tidak diproses ulang.
+        
+        Args:
+            texts: Series teks mentah
+            num_workers: Jumlah worker process, > 1 untuk preprocessing paralel
+        
+        Returns:
+            Tuple (Series teks hasil preprocessing dengan index sama, dict statistik dedup)
+        """
+        start = time.perf_counter()
+        
+        codes, raw_uniques = pd.factorize(texts)
+        raw_uniques = np.asarray(raw_uniques, dtype=object)
+        
+        # Slot terakhir = '' untuk kode -1 (NaN di factorize)
+        by_raw = np.empty(len(raw_uniques) + 1, dtype=object)
+        by_raw[-1] = ''
+        
+        stored = self.store.get_many(raw_uniques) if self.store is not None else {}
+        for pos, processed_text in stored.items():
+            by_raw[pos] = processed_text
+        missing = np.array([pos for pos in range(len(raw_uniques)) if pos not in stored], dtype=np.intp)
+        
+        cleaned = self.clean_series(pd.Series(raw_uniques[missing], dtype=object))
+        clean_codes, clean_uniques = pd.factorize(cleaned)
+        
+        if num_workers and num_workers > 1:
+            processed = self.preprocess_cleaned_parallel(list(clean_uniques), num_workers=num_workers)
+        else:
+            processed = self.remove_stopwords_and_stem_series(pd.Series(clean_uniques, dtype=object)).tolist()
+        
+        if len(missing):
+            by_raw[missing] = np.asarray(processed, dtype=object)[clean_codes]
+            if self.store is not None:
+                self.store.put_many(raw_uniques[missing], by_raw[missing])
+        result = pd.Series(by_raw[codes], index=texts.index, dtype=object)
+        
+        elapsed = time.perf_counter() - start
+        total = len(texts)
+        unique = len(clean_uniques)
+        per_text = elapsed / unique if unique else 0
+        stats = {
+            'rows': total,
+            'unique_raw': len(raw_uniques),
+            'stored': len(stored),
+            'unique_cleaned': unique,
+            'duplicate_ratio': (1 - (unique + len(stored)) / total) * 100 if total else 0,
+            'elapsed_sec': elapsed,
+            'saved_sec': per_text * (total - unique)
+        }
+        
+        return result, stats
+    
+    def print_dedup_stats(self, stats):
+        """Print statistik deduplikasi preprocessing"""
+        print(f"[DEDUP] {stats['rows']} baris -> {stats['unique_raw']} teks unik "
+              f"({stats['stored']} dari preprocess store) -> {stats['unique_cleaned']} diproses "
+              f"(duplikat {stats['duplicate_ratio']:.1f}%)")
+        print(f"[DEDUP] Waktu {stats['elapsed_sec']:.2f} s, perkiraan waktu dihemat {stats['saved_sec']:.2f} s")
+    
+    def preprocess_dataframe(self, df, num_workers=1):
         """
         Melakukan preprocessing pada DataFrame
         
         Args:
             df: DataFrame dengan kolom 'content'
+            num_workers: Jumlah worker process, > 1 untuk preprocessing paralel
         
         Returns:
             DataFrame dengan kolom 'processed_text' tambahan
@@ -119,15 +351,119 @@ class TextPreprocessor:
             print("[ERROR] Kolom 'content' tidak ditemukan!")
             return df
         
-        # Apply preprocessing ke setiap baris
-        df['processed_text'] = df['content'].apply(self.preprocess)
+        # Setiap teks unik hanya diproses sekali (komentar & judul berita banyak yang berulang)
+        df['processed_text'], dedup_stats = self.preprocess_unique(df['content'], num_workers=num_workers)
+        self.print_dedup_stats(dedup_stats)
         
         # Hapus baris dengan teks kosong setelah preprocessing
         df = df[df['processed_text'].str.strip() != '']
         
+        self.stem_cache.print_stats()
+        self.stem_cache.save()
+        if self.store is not None:
+            self.store.print_stats()
+        
         print(f"[SUCCESS] Preprocessing selesai untuk {len(df)} artikel")
         
         return df
+    
+    def preprocess_csv(self, input_path, output_path, chunk_size=10000, num_workers=1, cleaner=None):
+        """
+        Mode streaming: cleaning + preprocessing CSV per chunk, hasil di-append ke output
+        
+        Memori puncak dibatasi ukuran chunk, bukan ukuran korpus (yang tetap
+        disimpan hanya hash content untuk membuang duplikat antar chunk).
+        
+        Args:
+            input_path: CSV data mentah (misalnya data/raw_data.csv)
+            output_path: CSV hasil dengan kolom 'processed_text' tambahan
+            chunk_size: Jumlah baris per chunk
+            num_workers: Jumlah worker process, > 1 untuk preprocessing paralel
+            cleaner: DataCleaner (duplikat, spam, panjang tidak valid), None = tanpa cleaning
+        
+        Returns:
+            Jumlah baris yang ditulis ke output_path
+        """
+        print(f"[INFO] Preprocessing streaming: {input_path} -> {output_path} (chunk {chunk_size} baris)")
+        
+        directory = os.path.dirname(output_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        
+        seen_keys = set()
+        total_read = 0
+        total_written = 0
+        
+        for chunk_index, chunk in enumerate(pd.read_csv(input_path, encoding='utf-8-sig', chunksize=chunk_size)):
+            total_read += len(chunk)
+            
+            if 'content' not in chunk.columns:
+                print("[ERROR] Kolom 'content' tidak ditemukan!")
+                return 0
+            
+            if cleaner is not None:
+                chunk = cleaner.remove_seen_duplicates(chunk, seen_keys)
+                chunk = chunk[~chunk['content'].apply(cleaner.is_spam).astype(bool)]
+                chunk = chunk[chunk['content'].apply(cleaner.is_valid_length).astype(bool)]
+            
+            chunk = chunk.copy()
+            chunk['processed_text'], dedup_stats = self.preprocess_unique(chunk['content'], num_workers=num_workers)
+            chunk = chunk[chunk['processed_text'].str.strip() != '']
+            
+            # Header & BOM hanya di chunk pertama
+            first = total_written == 0
+            chunk.to_csv(
+                output_path,
+                mode='w' if first else 'a',
+                header=first,
+                index=False,
+                encoding='utf-8-sig' if first else 'utf-8'
+            )
+            total_written += len(chunk)
+            
+            print(f"[INFO] Chunk {chunk_index + 1}: {dedup_stats['rows']} baris -> {len(chunk)} ditulis "
+                  f"({dedup_stats['elapsed_sec']:.2f} s, total {total_written}/{total_read})")
+        
+        # Semua baris terbuang: tetap tulis header agar output bisa dibaca
+        if total_written == 0 and total_read > 0:
+            chunk.iloc[:0].to_csv(output_path, index=False, encoding='utf-8-sig')
+        
+        self.stem_cache.print_stats()
+        self.stem_cache.save()
+        if self.store is not None:
+            self.store.print_stats()
+        
+        print(f"[SUCCESS] Preprocessing streaming selesai: {total_written} dari {total_read} baris")
+        print(f"[SAVE] Data hasil preprocessing disimpan ke: {output_path}")
+        
+        return total_written
+
+
+# State worker process untuk preprocess_cleaned_parallel
+_worker_preprocessor = None
+_worker_known_words = None
+
+
+def _init_worker(stem_entries, stem_cache_size):
+    """Initializer worker: buat preprocessor (stemmer sendiri) sekali, isi stem cache awal"""
+    global _worker_preprocessor, _worker_known_words
+    _worker_preprocessor = TextPreprocessor(stem_cache_size=stem_cache_size)
+    _worker_preprocessor.stem_cache.entries.update(stem_entries)
+    _worker_known_words = set(stem_entries)
+
+
+def _preprocess_shard(texts):
+    """Preprocess satu shard, return (hasil, kata baru di stem cache, hit, miss)"""
+    stem_cache = _worker_preprocessor.stem_cache
+    stem_cache.hits = 0
+    stem_cache.misses = 0
+    
+    processed = [_worker_preprocessor.remove_stopwords_and_stem(text) for text in texts]
+    
+    new_stems = {word: stem for word, stem in stem_cache.entries.items() if word not in _worker_known_words}
+    _worker_known_words.update(new_stems)
+    
+    return processed, new_stems, stem_cache.hits, stem_cache.misses
 
 
 def main():
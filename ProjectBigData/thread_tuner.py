@@ -0,0 +1,209 @@
+# thread_tuner.py
+"""
+Auto-tuning jumlah thread torch (intra-op & inter-op) dan batch size
+
+Kalibrasi singkat di host yang sebenarnya, hasil terbaik disimpan ke file
+JSON lokal lalu diterapkan IndoBERTSentimentAnalyzer saat startup
+(parameter thread_config_path).
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import time
+from concurrent.futures import ProcessPoolExecutor
+import torch
+
+import config
+
+
+def default_thread_candidates():
+    """Kandidat jumlah thread intra-op: 1, 2, 4, ... sampai jumlah CPU"""
+    cpu_count = os.cpu_count() or 1
+    candidates = [1]
+    while candidates[-1] * 2 <= cpu_count:
+        candidates.append(candidates[-1] * 2)
+    if candidates[-1] != cpu_count:
+        candidates.append(cpu_count)
+    return candidates
+
+
+def host_info():
+    """Identitas host, hasil tuning hanya berlaku untuk host yang sama"""
+    return {
+        'host': platform.node(),
+        'cpu_count': os.cpu_count(),
+        'torch': torch.__version__
+    }
+
+
+def _calibrate_config(init_kwargs, texts, intra_op, inter_op, batch_sizes, max_length):
+    """
+    Ukur throughput satu konfigurasi thread di process terpisah
+
+    set_num_interop_threads hanya bisa dipanggil sekali per process,
+    jadi setiap konfigurasi dijalankan di process baru.
+    """
+    from indobert_analyzer import IndoBERTSentimentAnalyzer
+
+    torch.set_num_interop_threads(inter_op)
+    torch.set_num_threads(intra_op)
+
+    analyzer = IndoBERTSentimentAnalyzer(**init_kwargs)
+    analyzer.warmup()
+
+    results = []
+    for batch_size in batch_sizes:
+        analyzer.predict_proba_texts(texts[:batch_size], batch_size=batch_size, max_length=max_length, show_progress=False)
+
+        start = time.perf_counter()
+        analyzer.predict_proba_texts(texts, batch_size=batch_size, max_length=max_length, show_progress=False)
+        elapsed = time.perf_counter() - start
+
+        results.append({
+            'intra_op_threads': intra_op,
+            'inter_op_threads': inter_op,
+            'batch_size': batch_size,
+            'texts_per_sec': len(texts) / elapsed if elapsed > 0 else 0
+        })
+
+    return results
+
+
+def calibrate(texts, init_kwargs=None, thread_candidates=None, interop_candidates=(1, 2),
+              batch_sizes=(8, 16, 32), max_length=128):
+    """
+    Jalankan kalibrasi untuk semua kombinasi thread & batch size
+
+    Args:
+        texts: Korpus kalibrasi (cukup beberapa ratus teks)
+        init_kwargs: Argumen IndoBERTSentimentAnalyzer (default dari config)
+        thread_candidates: Kandidat jumlah thread intra-op
+        interop_candidates: Kandidat jumlah thread inter-op
+        batch_sizes: Kandidat batch size
+        max_length: Panjang maksimal token saat kalibrasi
+
+    Returns:
+        dict hasil tuning (konfigurasi terbaik + semua hasil + info host)
+    """
+    init_kwargs = init_kwargs or {
+        'backend': config.SENTIMENT_BACKEND,
+        'quantize': config.ONNX_QUANTIZE,
+        'onnx_dir': config.ONNX_MODEL_DIR,
+        'model_path': config.SENTIMENT_MODEL_PATH,
+        'local_files_only': config.SENTIMENT_OFFLINE,
+        'student_path': config.STUDENT_MODEL_PATH
+    }
+    thread_candidates = thread_candidates or default_thread_candidates()
+
+    print(f"[INFO] Kalibrasi thread: intra-op {list(thread_candidates)} x inter-op {list(interop_candidates)} "
+          f"x batch {list(batch_sizes)} ({len(texts)} teks)")
+
+    results = []
+    context = multiprocessing.get_context('spawn')
+    for intra_op in thread_candidates:
+        for inter_op in interop_candidates:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                config_results = executor.submit(
+                    _calibrate_config, init_kwargs, texts, intra_op, inter_op, list(batch_sizes), max_length
+                ).result()
+
+            for result in config_results:
+                print(f"[TUNE] intra={result['intra_op_threads']:<3d} inter={result['inter_op_threads']:<2d} "
+                      f"batch={result['batch_size']:<3d} -> {result['texts_per_sec']:8.1f} teks/detik")
+            results.extend(config_results)
+
+    best = max(results, key=lambda result: result['texts_per_sec'])
+
+    return {
+        **host_info(),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'max_length': max_length,
+        'intra_op_threads': best['intra_op_threads'],
+        'inter_op_threads': best['inter_op_threads'],
+        'batch_size': best['batch_size'],
+        'texts_per_sec': best['texts_per_sec'],
+        'results': results
+    }
+
+
+def save_tuning(tuning, path):
+    """Simpan hasil tuning ke file JSON"""
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(tuning, f, indent=2)
+    print(f"[SAVE] Hasil tuning thread disimpan ke: {path}")
+
+
+def load_tuning(path):
+    """
+    Load hasil tuning jika ada dan dibuat di host yang sama
+
+    Returns:
+        dict hasil tuning atau None
+    """
+    if not path or not os.path.exists(path):
+        return None
+
+    with open(path, 'r', encoding='utf-8') as f:
+        tuning = json.load(f)
+
+    current = host_info()
+    if tuning.get('host') != current['host'] or tuning.get('cpu_count') != current['cpu_count']:
+        print(f"[WARNING] Hasil tuning {path} dibuat di host lain, jalankan ulang thread_tuner.py")
+        return None
+
+    return tuning
+
+
+def apply_tuning(tuning):
+    """Terapkan jumlah thread torch dari hasil tuning"""
+    torch.set_num_threads(tuning['intra_op_threads'])
+
+    try:
+        torch.set_num_interop_threads(tuning['inter_op_threads'])
+    except RuntimeError:
+        # Hanya bisa di-set sebelum ada operasi paralel torch di process ini
+        if torch.get_num_interop_threads() != tuning['inter_op_threads']:
+            print(f"[WARNING] Thread inter-op tidak bisa diubah lagi (tetap {torch.get_num_interop_threads()})")
+
+    print(f"[INFO] Thread torch: intra-op {torch.get_num_threads()}, inter-op {torch.get_num_interop_threads()} "
+          f"(batch size {tuning['batch_size']})")
+
+
+def main():
+    """Jalankan kalibrasi dari command line"""
+    from benchmark_analyzer import load_corpus, parse_list
+
+    parser = argparse.ArgumentParser(description='Auto-tuning thread torch untuk host ini')
+    parser.add_argument('--threads', default=None, help='Contoh: 1,2,4,8 (default: 1, 2, 4, ... jumlah CPU)')
+    parser.add_argument('--interop', default='1,2')
+    parser.add_argument('--batch-sizes', default='8,16,32')
+    parser.add_argument('--max-length', type=int, default=128)
+    parser.add_argument('--num-texts', type=int, default=256)
+    parser.add_argument('--data', default='data/processed_data.csv')
+    parser.add_argument('--output', default=config.THREAD_TUNING_PATH)
+    args = parser.parse_args()
+
+    texts = load_corpus(args.data, num_texts=args.num_texts)
+    tuning = calibrate(
+        texts,
+        thread_candidates=parse_list(args.threads) if args.threads else None,
+        interop_candidates=parse_list(args.interop),
+        batch_sizes=parse_list(args.batch_sizes),
+        max_length=args.max_length
+    )
+
+    print(f"\n[RESULT] Konfigurasi terbaik: intra-op {tuning['intra_op_threads']}, "
+          f"inter-op {tuning['inter_op_threads']}, batch {tuning['batch_size']} "
+          f"({tuning['texts_per_sec']:.1f} teks/detik)")
+    save_tuning(tuning, args.output)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,222 @@
+# token_store.py
+"""
+Penyimpanan hasil tokenisasi (input ids) dalam file NumPy memory-mapped
+
+Teks yang sama tidak perlu di-tokenize ulang pada run berikutnya (beda
+threshold, backend, dsb), dan beberapa worker process bisa membaca store
+yang sama tanpa menyalin seluruh isinya ke memori. Penulisan dilindungi
+file lock sehingga beberapa process (misalnya sentiment_server.py dan
+main.py) aman memakai folder store yang sama.
+"""
+
+import hashlib
+import os
+from contextlib import contextmanager
+import numpy as np
+import torch
+from transformers import BatchEncoding
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def file_lock(lock_path):
+    """File lock eksklusif antar process (fcntl di Linux/macOS, msvcrt di Windows)"""
+    with open(lock_path, 'a+b') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK menyerah setelah ~10 detik, coba lagi
+
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class TokenStore:
+    def __init__(self, store_dir, tokenizer_id, max_length=512):
+        """
+        Initialize token store untuk satu tokenizer + max_length
+
+        Args:
+            store_dir: Folder induk token store
+            tokenizer_id: Nama/path tokenizer (hasil tokenisasi beda per tokenizer)
+            max_length: Panjang maksimal token (truncation beda per max_length)
+        """
+        self.tokenizer_id = tokenizer_id
+        self.max_length = max_length
+
+        name = tokenizer_id.strip('/').replace('/', '__')
+        self.path = os.path.join(store_dir, f'{name}_{max_length}')
+        if not os.path.exists(self.path):
+            os.makedirs(self.path)
+
+        self.ids_path = os.path.join(self.path, 'input_ids.bin')
+        self.index_path = os.path.join(self.path, 'index.npz')
+        self.lock_path = os.path.join(self.path, 'store.lock')
+
+        # Index: hash teks -> posisi awal & jumlah token di input_ids.bin
+        self.index = {}
+        self._load_index()
+
+        self.ids = None
+        self._open_ids()
+
+    def _load_index(self):
+        """Gabungkan index di disk (bisa berisi teks dari process lain) ke index di memori"""
+        if not os.path.exists(self.index_path):
+            return
+
+        with np.load(self.index_path) as saved:
+            self.index.update({
+                key: (int(offset), int(length))
+                for key, offset, length in zip(saved['keys'], saved['offsets'], saved['lengths'])
+            })
+
+    def _locked(self):
+        """File lock eksklusif antar process selama append & simpan index"""
+        return file_lock(self.lock_path)
+
+    def _open_ids(self):
+        """Buka (ulang) file input ids sebagai memmap read-only"""
+        if os.path.exists(self.ids_path) and os.path.getsize(self.ids_path) > 0:
+            self.ids = np.memmap(self.ids_path, dtype=np.int32, mode='r')
+        else:
+            self.ids = np.zeros(0, dtype=np.int32)
+
+    @staticmethod
+    def text_key(text):
+        """Hash teks sebagai key store"""
+        return hashlib.sha1(text.encode('utf-8')).digest()
+
+    def __len__(self):
+        return len(self.index)
+
+    def lookup(self, texts, tokenizer):
+        """
+        Ambil posisi token untuk list teks, tokenize & simpan teks yang belum ada
+
+        Args:
+            texts: List teks
+            tokenizer: Tokenizer Hugging Face (harus sesuai tokenizer_id)
+
+        Returns:
+            Tuple (offsets, lengths) numpy array, urutan sama dengan texts
+        """
+        keys = [self.text_key(text) for text in texts]
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in self.index and key not in missing:
+                missing[key] = text
+
+        if missing:
+            # Teks mungkin sudah ditambahkan process lain (misalnya parent dari worker pool)
+            self._load_index()
+            missing = {key: text for key, text in missing.items() if key not in self.index}
+            if missing:
+                self._append(list(missing.keys()), list(missing.values()), tokenizer)
+            else:
+                self._open_ids()
+
+        offsets = np.array([self.index[key][0] for key in keys], dtype=np.int64)
+        lengths = np.array([self.index[key][1] for key in keys], dtype=np.int64)
+
+        return offsets, lengths
+
+    def _append(self, keys, texts, tokenizer):
+        """Tokenize teks baru, append ke input_ids.bin, lalu simpan index"""
+        encodings = tokenizer(texts, truncation=True, max_length=self.max_length, padding=False)
+
+        with self._locked():
+            # Process lain mungkin sudah menambah teks sejak index terakhir dibaca
+            self._load_index()
+
+            # Posisi append dari ukuran file sebenarnya, bukan memmap process ini
+            offset = os.path.getsize(self.ids_path) // 4 if os.path.exists(self.ids_path) else 0
+            with open(self.ids_path, 'ab') as f:
+                for key, ids in zip(keys, encodings['input_ids']):
+                    if key in self.index:
+                        continue
+                    np.asarray(ids, dtype=np.int32).tofile(f)
+                    self.index[key] = (offset, len(ids))
+                    offset += len(ids)
+
+            self._save_index()
+
+        self._open_ids()
+
+    def _save_index(self):
+        """Simpan index secara atomik (tulis file sementara lalu replace), dipanggil saat lock dipegang"""
+        keys = list(self.index.keys())
+        temp_path = f'{self.index_path}.{os.getpid()}.tmp.npz'
+        np.savez(
+            temp_path,
+            keys=np.array(keys, dtype='S20'),
+            offsets=np.array([self.index[key][0] for key in keys], dtype=np.int64),
+            lengths=np.array([self.index[key][1] for key in keys], dtype=np.int64)
+        )
+        os.replace(temp_path, self.index_path)
+
+    def pad_batch(self, offsets, lengths, pad_token_id):
+        """
+        Bangun batch ter-pad (dynamic padding) langsung dari memmap
+
+        Args:
+            offsets: Posisi awal token tiap teks di store
+            lengths: Jumlah token tiap teks
+            pad_token_id: Token id untuk padding
+
+        Returns:
+            BatchEncoding berisi tensor input_ids dan attention_mask
+        """
+        width = int(lengths.max()) if len(lengths) else 0
+        input_ids = np.full((len(lengths), width), pad_token_id, dtype=np.int64)
+        attention_mask = np.zeros((len(lengths), width), dtype=np.int64)
+
+        for row, (offset, length) in enumerate(zip(offsets, lengths)):
+            input_ids[row, :length] = self.ids[offset:offset + length]
+            attention_mask[row, :length] = 1
+
+        return BatchEncoding({
+            'input_ids': torch.from_numpy(input_ids),
+            'attention_mask': torch.from_numpy(attention_mask)
+        })
+
+
+def main():
+    """Pre-tokenize processed_data.csv ke token store"""
+    import pandas as pd
+    import config
+    from indobert_analyzer import IndoBERTSentimentAnalyzer
+
+    analyzer = IndoBERTSentimentAnalyzer(
+        model_path=config.SENTIMENT_MODEL_PATH,
+        local_files_only=config.SENTIMENT_OFFLINE
+    )
+    df = pd.read_csv('data/processed_data.csv', encoding='utf-8-sig')
+    texts = [text for text in df['content'].astype(str) if text.strip()]
+
+    store = TokenStore(config.TOKEN_STORE_DIR, analyzer.model_id, max_length=512)
+    before = len(store)
+    store.lookup(texts, analyzer.tokenizer)
+    print(f"[INFO] Token store {store.path}: {len(store)} teks ({len(store) - before} baru)")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,147 @@
+# vector_store.py
+"""
+Penyimpanan embedding teks (float16, memory-mapped) sejajar dengan row id
+
+Embedding diambil dari forward pass yang sama dengan analisis sentimen
+(IndoBERTSentimentAnalyzer.score_texts dengan return_embeddings=True) dan
+dipakai untuk clustering, deteksi near-duplicate, dan similarity search.
+"""
+
+import json
+import os
+import numpy as np
+
+
+class VectorStore:
+    def __init__(self, path='data/vector_store'):
+        """
+        Initialize vector store
+
+        Args:
+            path: Folder vector store (vectors.f16, row_ids.npy, meta.json)
+        """
+        self.path = path
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+        self.vectors_path = os.path.join(path, 'vectors.f16')
+        self.row_ids_path = os.path.join(path, 'row_ids.npy')
+        self.meta_path = os.path.join(path, 'meta.json')
+
+        self.meta = {'dim': None, 'count': 0, 'model_id': None}
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                self.meta = json.load(f)
+
+        self.row_ids = np.load(self.row_ids_path) if os.path.exists(self.row_ids_path) else np.array([], dtype=str)
+
+    def __len__(self):
+        return self.meta['count']
+
+    @property
+    def vectors(self):
+        """Matriks embedding (count, dim) float16 ter-normalisasi, memmap read-only"""
+        if self.meta['count'] == 0:
+            return np.zeros((0, self.meta['dim'] or 0), dtype=np.float16)
+        return np.memmap(self.vectors_path, dtype=np.float16, mode='r', shape=(self.meta['count'], self.meta['dim']))
+
+    def add(self, row_ids, vectors, model_id=None):
+        """
+        Tambahkan embedding (di-normalisasi L2 lalu disimpan sebagai float16)
+
+        Args:
+            row_ids: List identitas baris, sejajar dengan vectors
+            vectors: numpy array (n, dim)
+            model_id: Model sumber embedding (embedding beda model tidak boleh dicampur)
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(vectors) == 0:
+            return
+
+        if self.meta['dim'] is None:
+            self.meta['dim'] = int(vectors.shape[1])
+            self.meta['model_id'] = model_id
+        elif vectors.shape[1] != self.meta['dim']:
+            raise ValueError(f"Dimensi embedding {vectors.shape[1]} tidak sama dengan store ({self.meta['dim']})")
+        elif model_id and self.meta['model_id'] and model_id != self.meta['model_id']:
+            raise ValueError(f"Embedding dari model {model_id}, store berisi model {self.meta['model_id']}")
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms > 0, norms, 1)
+
+        with open(self.vectors_path, 'ab') as f:
+            vectors.astype(np.float16).tofile(f)
+
+        self.row_ids = np.concatenate([self.row_ids, np.asarray(row_ids, dtype=str)])
+        np.save(self.row_ids_path, self.row_ids)
+
+        self.meta['count'] = len(self.row_ids)
+        with open(self.meta_path, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f)
+
+    def query(self, vector, top_k=10, exclude=None, chunk_size=65536):
+        """
+        Cari embedding paling mirip (cosine similarity, brute force per chunk)
+
+        Args:
+            vector: Embedding query (dim,)
+            top_k: Jumlah hasil
+            exclude: Row id yang tidak diikutkan (misalnya row query itu sendiri)
+            chunk_size: Jumlah baris per perhitungan agar memori tetap kecil
+
+        Returns:
+            List tuple (row_id, similarity), urut dari paling mirip
+        """
+        query = np.asarray(vector, dtype=np.float32).ravel()
+        query = query / (np.linalg.norm(query) or 1)
+
+        vectors = self.vectors
+        scores = np.empty(len(vectors), dtype=np.float32)
+        for start in range(0, len(vectors), chunk_size):
+            scores[start:start + chunk_size] = vectors[start:start + chunk_size].astype(np.float32) @ query
+
+        if exclude is not None:
+            scores[self.row_ids == str(exclude)] = -np.inf
+
+        top_k = min(top_k, len(scores))
+        if top_k == 0:
+            return []
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+
+        return [(str(self.row_ids[i]), float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+    def query_by_id(self, row_id, top_k=10):
+        """Cari baris yang paling mirip dengan baris row_id (near-duplicate)"""
+        positions = np.flatnonzero(self.row_ids == str(row_id))
+        if len(positions) == 0:
+            print(f"[ERROR] Row id tidak ditemukan di vector store: {row_id}")
+            return []
+
+        return self.query(self.vectors[positions[-1]], top_k=top_k, exclude=row_id)
+
+    def clear(self):
+        """Hapus semua embedding"""
+        for path in (self.vectors_path, self.row_ids_path, self.meta_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self.meta = {'dim': None, 'count': 0, 'model_id': None}
+        self.row_ids = np.array([], dtype=str)
+
+
+def main():
+    """Testing vector store"""
+    import tempfile
+
+    store = VectorStore(os.path.join(tempfile.mkdtemp(), 'vector_store'))
+    vectors = np.random.RandomState(0).randn(100, 16)
+    store.add([f'row{i}' for i in range(100)], vectors, model_id='test')
+
+    print(f"[INFO] Vector store: {len(store)} embedding, dim {store.meta['dim']}")
+    print("[INFO] Paling mirip dengan row0:")
+    for row_id, score in store.query_by_id('row0', top_k=5):
+        print(f"   {row_id}: {score:.4f}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -2,7 +2,7 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from wordcloud import WordCloud
+from wordcloud import WordCloud, STOPWORDS
 import os
 import numpy as np
 
@@ -31,7 +31,9 @@ class SentimentVisualizer:
             print("[ERROR] Kolom 'opinion' tidak ditemukan!")
             return
         
+        # Kolom categorical ikut menghitung kategori dengan jumlah 0, buang agar tidak jadi irisan kosong
         opinion_counts = df['opinion'].value_counts()
+        opinion_counts = opinion_counts[opinion_counts > 0]
         
         # Filter hanya Setuju dan Tidak Setuju
         filtered_counts = {}
@@ -47,8 +49,10 @@ class SentimentVisualizer:
         # Buat plot
         fig, ax = plt.subplots(figsize=(10, 8))
         
-        colors = ['#2ecc71', '#e74c3c']
-        explode = (0.05, 0.05)
+        # Warna & explode mengikuti irisan yang ada (bisa hanya satu opini)
+        color_map = {'Setuju': '#2ecc71', 'Tidak Setuju': '#e74c3c'}
+        colors = [color_map[label] for label in filtered_counts]
+        explode = [0.05] * len(filtered_counts)
         
         wedges, texts, autotexts = ax.pie(
             filtered_counts.values(),
@@ -253,7 +257,7 @@ class SentimentVisualizer:
         except Exception as e:
             print(f"[ERROR] Gagal membuat grafik tren: {str(e)}")
     
-    def create_wordcloud(self, df, sentiment_type, show=True):
+    def create_wordcloud(self, df, sentiment_type, show=True, word_corpus=None):
         """
         Membuat wordcloud untuk sentimen tertentu
         
@@ -261,6 +265,8 @@ class SentimentVisualizer:
             df: DataFrame dengan kolom 'sentiment' dan 'processed_text'
             sentiment_type: 'Positif' atau 'Negatif'
             show: Apakah menampilkan plot
+            word_corpus: WordCorpus processed_text (index sama dengan df), None = dari string.
+                Tanpa collocation (bigram) dan penggabungan bentuk jamak WordCloud.generate.
         """
         if 'sentiment' not in df.columns or 'processed_text' not in df.columns:
             print("[ERROR] Kolom 'sentiment' atau 'processed_text' tidak ditemukan!")
@@ -273,10 +279,16 @@ class SentimentVisualizer:
             print(f"[WARNING] Tidak ada artikel dengan sentimen {sentiment_type}")
             return
         
-        # Gabungkan semua teks
-        text = ' '.join(df_filtered['processed_text'].astype(str))
+        if word_corpus is not None:
+            # Frekuensi kata langsung dari id kata (tanpa gabung & split ulang teks)
+            frequencies = word_corpus.select(df_filtered.index).term_frequencies(min_length=2, exclude=STOPWORDS)
+            has_text = bool(frequencies)
+        else:
+            # Gabungkan semua teks
+            text = ' '.join(df_filtered['processed_text'].astype(str))
+            has_text = bool(text.strip())
         
-        if not text.strip():
+        if not has_text:
             print(f"[WARNING] Tidak ada teks untuk sentimen {sentiment_type}")
             return
         
@@ -289,7 +301,11 @@ class SentimentVisualizer:
             max_words=100,
             relative_scaling=0.5,
             min_font_size=10
-        ).generate(text)
+        )
+        if word_corpus is not None:
+            wordcloud.generate_from_frequencies(frequencies)
+        else:
+            wordcloud.generate(text)
         
         # Plot
         fig, ax = plt.subplots(figsize=(16, 8))
@@ -311,13 +327,14 @@ class SentimentVisualizer:
         else:
             plt.close()
     
-    def create_all_visualizations(self, df, show=True):
+    def create_all_visualizations(self, df, show=True, word_corpus=None):
         """
         Membuat semua visualisasi sekaligus
         
         Args:
             df: DataFrame hasil analisis sentimen
             show: Apakah menampilkan plot
+            word_corpus: WordCorpus processed_text untuk word cloud (opsional)
         """
         print("\n[INFO] Membuat visualisasi...")
         
@@ -334,10 +351,10 @@ class SentimentVisualizer:
         self.plot_sentiment_trend(df, show=show)
         
         # 5. Word cloud positif
-        self.create_wordcloud(df, 'Positif', show=show)
+        self.create_wordcloud(df, 'Positif', show=show, word_corpus=word_corpus)
         
         # 6. Word cloud negatif
-        self.create_wordcloud(df, 'Negatif', show=show)
+        self.create_wordcloud(df, 'Negatif', show=show, word_corpus=word_corpus)
         
         print("[SUCCESS] Semua visualisasi berhasil dibuat!")
 
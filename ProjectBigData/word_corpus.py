@@ -0,0 +1,211 @@
+# word_corpus.py
+"""
+Representasi ringkas processed_text: vocabulary bersama + id kata int32 (CSR)
+
+Teks di-split sekali saat corpus dibuat. Konsumen (TF-IDF model prediksi,
+word cloud) langsung menghitung frekuensi dari id kata tanpa memecah ulang
+string processed_text.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+class WordCorpus:
+    def __init__(self, vocabulary, offsets, ids, index=None):
+        """
+        Initialize word corpus
+
+        Args:
+            vocabulary: Array kata (id kata = posisi di array)
+            offsets: Array int64 (n_docs + 1,), kata dokumen i = ids[offsets[i]:offsets[i + 1]]
+            ids: Array int32 id kata semua dokumen berurutan
+            index: Label baris DataFrame sumber (default: 0..n_docs-1)
+        """
+        self.vocabulary = np.asarray(vocabulary, dtype=object)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.ids = np.asarray(ids, dtype=np.int32)
+        self.index = pd.Index(np.arange(len(self.offsets) - 1) if index is None else index)
+
+    @classmethod
+    def from_texts(cls, texts):
+        """
+        Bangun corpus dari Series processed_text (satu kali split untuk seluruh kolom)
+
+        Args:
+            texts: Series teks hasil preprocessing (kata dipisah spasi)
+
+        Returns:
+            WordCorpus dengan index sama dengan texts
+        """
+        texts = pd.Series(texts, dtype=object)
+        words = texts.fillna('').astype(str).reset_index(drop=True).str.split().explode()
+        words = words[words.notna()]
+
+        ids, vocabulary = pd.factorize(words)
+        counts = np.bincount(words.index.to_numpy(dtype=np.int64), minlength=len(texts))
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+
+        return cls(np.asarray(vocabulary, dtype=object), offsets, ids.astype(np.int32), index=texts.index)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def get_tokens(self, position):
+        """Kata-kata dokumen ke-position (untuk debugging)"""
+        return self.vocabulary[self.ids[self.offsets[position]:self.offsets[position + 1]]].tolist()
+
+    def select(self, labels):
+        """
+        Ambil sub-corpus berdasarkan label index (misalnya df_filtered.index)
+
+        Returns:
+            WordCorpus dengan vocabulary yang sama
+        """
+        positions = self.index.get_indexer(labels)
+        if (positions < 0).any():
+            raise KeyError("Sebagian label baris tidak ada di word corpus")
+
+        starts = self.offsets[positions]
+        lengths = self.offsets[positions + 1] - starts
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+
+        # Posisi setiap kata terpilih di self.ids, tanpa loop per dokumen
+        gather = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+
+        return WordCorpus(self.vocabulary, offsets, self.ids[gather], index=labels)
+
+    def count_matrix(self, dtype=np.int64):
+        """Matriks jumlah kata (n_docs, n_vocabulary) scipy CSR"""
+        matrix = sparse.csr_matrix(
+            (np.ones(len(self.ids), dtype=dtype), self.ids, self.offsets),
+            shape=(len(self), len(self.vocabulary))
+        )
+        matrix.sum_duplicates()
+        return matrix
+
+    def term_frequencies(self, min_length=1, exclude=None):
+        """
+        Frekuensi total setiap kata
+
+        Args:
+            min_length: Panjang kata minimal
+            exclude: Kumpulan kata yang tidak diikutkan
+
+        Returns:
+            dict {kata: jumlah}
+        """
+        counts = np.bincount(self.ids, minlength=len(self.vocabulary))
+        exclude = exclude or ()
+        return {
+            word: int(count)
+            for word, count in zip(self.vocabulary, counts)
+            if count > 0 and len(word) >= min_length and word not in exclude
+        }
+
+    def fit_tfidf(self, max_features=None, min_df=1):
+        """
+        Fit TfidfVectorizer dari id kata (hasil sama dengan fit_transform pada teks)
+
+        Seleksi kata mengikuti CountVectorizer: token_pattern default
+        (minimal 2 karakter), urut alfabet, min_df, lalu max_features kata
+        paling sering. Vectorizer yang dihasilkan tetap bisa transform teks
+        biasa (dipakai mode cascade).
+
+        Returns:
+            Tuple (TfidfVectorizer, matriks TF-IDF dokumen corpus ini)
+        """
+        from sklearn.feature_extraction.text import TfidfVectorizer, TfidfTransformer
+
+        counts = self.count_matrix()
+        terms = np.array([len(word) >= 2 for word in self.vocabulary], dtype=bool)
+        terms &= np.asarray(counts.sum(axis=0)).ravel() > 0
+
+        # Urut alfabet seperti CountVectorizer._sort_features
+        candidates = np.flatnonzero(terms)
+        candidates = candidates[np.argsort(self.vocabulary[candidates].astype(str), kind='stable')]
+        counts = counts[:, candidates]
+
+        mask = np.diff(counts.tocsc().indptr) >= min_df
+        if max_features is not None and mask.sum() > max_features:
+            tfs = np.asarray(counts.sum(axis=0)).ravel()
+            mask_inds = (-tfs[mask]).argsort()[:max_features]
+            new_mask = np.zeros(len(mask), dtype=bool)
+            new_mask[np.flatnonzero(mask)[mask_inds]] = True
+            mask = new_mask
+
+        if not mask.any():
+            raise ValueError("Setelah seleksi min_df / max_features tidak ada kata tersisa")
+
+        selected = self.vocabulary[candidates[mask]].tolist()
+        transformer = TfidfTransformer()
+        matrix = transformer.fit_transform(counts[:, mask])
+
+        vectorizer = TfidfVectorizer(vocabulary=selected)
+        vectorizer.idf_ = transformer.idf_
+
+        return vectorizer, matrix
+
+    def transform_tfidf(self, vectorizer):
+        """
+        Matriks TF-IDF dokumen corpus ini dengan vectorizer hasil fit_tfidf
+
+        Returns:
+            scipy CSR (n_docs, jumlah kata vectorizer)
+        """
+        from sklearn.preprocessing import normalize
+
+        columns = np.array([vectorizer.vocabulary_.get(word, -1) for word in self.vocabulary], dtype=np.int64)
+        keep = columns[self.ids] >= 0
+        rows = np.repeat(np.arange(len(self)), np.diff(self.offsets))
+
+        counts = sparse.csr_matrix(
+            (np.ones(keep.sum(), dtype=np.float64), (rows[keep], columns[self.ids][keep])),
+            shape=(len(self), len(vectorizer.vocabulary_))
+        )
+        return normalize(counts.multiply(vectorizer.idf_).tocsr())
+
+    def save(self, path):
+        """Simpan corpus ke file .npz"""
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        np.savez(
+            path,
+            vocabulary=self.vocabulary.astype(str),
+            offsets=self.offsets,
+            ids=self.ids,
+            index=self.index.to_numpy()
+        )
+        print(f"[SAVE] Word corpus disimpan ke: {path}")
+
+    @classmethod
+    def load(cls, path):
+        """Load corpus dari file .npz"""
+        with np.load(path, allow_pickle=True) as saved:
+            return cls(saved['vocabulary'].astype(object), saved['offsets'], saved['ids'], index=saved['index'])
+
+    def print_stats(self):
+        """Print ukuran corpus"""
+        size_mb = (self.offsets.nbytes + self.ids.nbytes) / 1024 / 1024
+        print(f"[INFO] Word corpus: {len(self)} dokumen, {len(self.ids)} kata, "
+              f"vocabulary {len(self.vocabulary)} ({size_mb:.2f} MB id + offset)")
+
+
+def main():
+    """Testing word corpus"""
+    texts = pd.Series(['main bola bagus', '', 'dukung main', 'tolak main bola'], index=[10, 11, 12, 13])
+    corpus = WordCorpus.from_texts(texts)
+    corpus.print_stats()
+
+    print(f"Vocabulary: {corpus.vocabulary.tolist()}")
+    print(f"Dokumen 13: {corpus.get_tokens(3)}")
+    print(f"Frekuensi: {corpus.term_frequencies()}")
+    print(f"Count matrix:\n{corpus.select([12, 13]).count_matrix().toarray()}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file